@@ -3,9 +3,10 @@ Intelligent Traffic Management System - Parking API Router
 Endpoints for managing parking zones and violations.
 """
 
+import asyncio
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.core.config import get_settings
 from app.services.parking import (
@@ -16,14 +17,16 @@ from app.services.parking import (
     create_sample_zones,
 )
 from app.core.database import (
-    insert_violation,
+    INSERT_DRIVER_SQL,
+    INSERT_DRIVER_VIOLATION_SQL,
+    INSERT_VIOLATION_SQL,
+    queue_write,
+    violation_params,
     insert_zone,
     delete_zone as db_delete_zone,
     list_zones as db_list_zones,
     list_violations as db_list_violations,
     get_violation as db_get_violation,
-    insert_driver,
-    insert_driver_violation,
     schedule_coroutine,
 )
 from app.services.scoring import (
@@ -36,88 +39,98 @@ router = APIRouter(prefix="/parking", tags=["Parking"])
 
 # Global parking detector instance (shared across requests)
 _detector: Optional[ParkingDetector] = None
+_detector_lock = asyncio.Lock()
 
 
 async def get_detector() -> ParkingDetector:
     """Get or create the global parking detector instance."""
     global _detector
-    if _detector is None:
-        # Attempt to load zones from DB
-        zones = await db_list_zones()
-        if not zones:
-            # Initialize with sample zones for demo and persist them
-            zones = create_sample_zones(1280, 720)
-            for z in zones:
-                schedule_coroutine(insert_zone(z))
-
-        # Violation callback: persist to DB and apply driver scoring
-        def _violation_callback(v: ParkingViolation):
-            try:
-                # 1. Persist parking violation to DB
-                schedule_coroutine(insert_violation(v))
-                
-                # 2. Apply driver scoring
-                # Use license plate if available, otherwise use track_id as driver_id
-                driver_id = v.license_plate if v.license_plate else f"TRACK-{v.track_id}"
-                
-                # Map zone type to violation type
-                vio_type = parking_zone_to_violation_type(v.zone_type.value if v.zone_type else "no_parking")
-                
-                # Get scoring engine and record violation
-                engine = get_scoring_engine()
-                driver_score, vio_record = engine.record_violation(
-                    driver_id=driver_id,
-                    violation_type=vio_type,
-                    location=v.zone_name,
-                    license_plate=v.license_plate,
-                    snapshot_path=v.snapshot_path,
-                    notes=f"Parking violation in {v.zone_name} for {v.duration_sec:.1f}s",
-                )
-                
-                # 3. Persist driver score update to DB
-                async def _persist_driver():
-                    await insert_driver(
-                        driver_id=driver_id,
-                        current_score=driver_score.current_score,
-                        total_violations=driver_score.total_violations,
-                        total_fines=driver_score.total_fines,
-                        created_at=driver_score.created_at,
-                        updated_at=driver_score.updated_at,
-                    )
-                    await insert_driver_violation(
-                        violation_id=vio_record.violation_id,
-                        driver_id=driver_id,
-                        violation_type=vio_type.value,
-                        timestamp=vio_record.timestamp,
-                        location=vio_record.location,
-                        points_deducted=vio_record.points_deducted,
-                        fine_amount=vio_record.fine_amount,
-                        license_plate=vio_record.license_plate,
-                        snapshot_path=vio_record.snapshot_path,
-                        notes=vio_record.notes,
-                    )
-                
-                schedule_coroutine(_persist_driver())
-                
-                print(f"⚠️ Violation scored: {driver_id} → Score: {driver_score.current_score} ({driver_score.risk_level})")
-                
-            except Exception as e:
-                print(f"Error in violation callback: {e}")
-
-        _detector = ParkingDetector(
-            zones=zones,
-            min_overlap=settings.parking_min_overlap,
-            violation_callback=_violation_callback,
-        )
+    if _detector is not None:
+        return _detector
+    # Creation awaits the DB, so guard it: concurrent first requests must not
+    # each build a detector (and each re-seed the sample zones)
+    async with _detector_lock:
+        if _detector is None:
+            _detector = await _create_detector()
     return _detector
 
 
+async def _create_detector() -> ParkingDetector:
+    """Build the parking detector from persisted (or sample) zones."""
+    # Attempt to load zones from DB
+    zones = await db_list_zones()
+    if not zones:
+        # Initialize with sample zones for demo and persist them
+        zones = create_sample_zones(1280, 720)
+        for z in zones:
+            schedule_coroutine(insert_zone(z))
+
+    # Violation callback: persist to DB and apply driver scoring
+    def _violation_callback(v: ParkingViolation):
+        try:
+            # 1. Persist parking violation to DB (batched commit)
+            queue_write(INSERT_VIOLATION_SQL, violation_params(v))
+            
+            # 2. Apply driver scoring
+            # Use license plate if available, otherwise use track_id as driver_id
+            driver_id = v.license_plate if v.license_plate else f"TRACK-{v.track_id}"
+            
+            # Map zone type to violation type
+            vio_type = parking_zone_to_violation_type(v.zone_type.value if v.zone_type else "no_parking")
+            
+            # Get scoring engine and record violation
+            engine = get_scoring_engine()
+            driver_score, vio_record = engine.record_violation(
+                driver_id=driver_id,
+                violation_type=vio_type,
+                location=v.zone_name,
+                license_plate=v.license_plate,
+                snapshot_path=v.snapshot_path,
+                notes=f"Parking violation in {v.zone_name} for {v.duration_sec:.1f}s",
+            )
+            
+            # 3. Persist driver score update to DB (same batched commit)
+            queue_write(INSERT_DRIVER_SQL, (
+                driver_id,
+                driver_score.current_score,
+                driver_score.total_violations,
+                driver_score.total_fines,
+                driver_score.created_at,
+                driver_score.updated_at,
+            ))
+            queue_write(INSERT_DRIVER_VIOLATION_SQL, (
+                vio_record.violation_id,
+                driver_id,
+                vio_type.value,
+                vio_record.timestamp,
+                vio_record.location,
+                vio_record.points_deducted,
+                vio_record.fine_amount,
+                vio_record.license_plate,
+                vio_record.snapshot_path,
+                vio_record.notes,
+            ))
+            
+            print(f"⚠️ Violation scored: {driver_id} → Score: {driver_score.current_score} ({driver_score.risk_level})")
+            
+        except Exception as e:
+            print(f"Error in violation callback: {e}")
+
+    return ParkingDetector(
+        zones=zones,
+        min_overlap=settings.parking_min_overlap,
+        violation_callback=_violation_callback,
+    )
+
+
 # =============================================================================
 # Pydantic models for request/response
 # =============================================================================
 
 class ZoneCreate(BaseModel):
     """Request model for creating a parking zone."""
+    model_config = ConfigDict(extra="forbid")
+    
     zone_id: str
     name: str
     polygon: List[List[int]]  # List of [x, y] points
@@ -129,6 +142,8 @@ class ZoneCreate(BaseModel):
 
 class ZoneResponse(BaseModel):
     """Response model for a parking zone."""
+    model_config = ConfigDict(frozen=True)
+    
     zone_id: str
     name: str
     polygon: List[List[int]]
@@ -139,6 +154,8 @@ class ZoneResponse(BaseModel):
 
 class ViolationResponse(BaseModel):
     """Response model for a parking violation."""
+    model_config = ConfigDict(frozen=True)
+    
     violation_id: str
     track_id: int
     zone_id: str
@@ -155,6 +172,8 @@ class ViolationResponse(BaseModel):
 
 class ZoneStatsResponse(BaseModel):
     """Response model for zone statistics."""
+    model_config = ConfigDict(frozen=True)
+    
     zone_id: str
     name: str
     type: str
@@ -163,6 +182,23 @@ class ZoneStatsResponse(BaseModel):
     active: bool
 
 
+def _zone_response(z: ParkingZone) -> dict:
+    """
+    Build a zone response payload.
+    
+    FastAPI validates return values against response_model anyway, so plain
+    dicts avoid constructing (and then re-dumping) a ZoneResponse per zone.
+    """
+    return {
+        "zone_id": z.zone_id,
+        "name": z.name,
+        "polygon": [list(p) for p in z.polygon],
+        "zone_type": z.zone_type.value,
+        "max_duration_sec": z.max_duration_sec,
+        "active": z.active,
+    }
+
+
 # =============================================================================
 # Zone Management Endpoints
 # =============================================================================
@@ -180,17 +216,7 @@ async def list_zones():
             zones = detector.get_zones()
     except Exception:
         zones = detector.get_zones()
-    return [
-        ZoneResponse(
-            zone_id=z.zone_id,
-            name=z.name,
-            polygon=[list(p) for p in z.polygon],
-            zone_type=z.zone_type.value,
-            max_duration_sec=z.max_duration_sec,
-            active=z.active,
-        )
-        for z in zones
-    ]
+    return [_zone_response(z) for z in zones]
 
 
 @router.get("/zones/{zone_id}", response_model=ZoneResponse)
@@ -200,15 +226,7 @@ async def get_zone(zone_id: str):
     if zone_id not in detector.zones:
         raise HTTPException(status_code=404, detail=f"Zone not found: {zone_id}")
     
-    z = detector.zones[zone_id]
-    return ZoneResponse(
-        zone_id=z.zone_id,
-        name=z.name,
-        polygon=[list(p) for p in z.polygon],
-        zone_type=z.zone_type.value,
-        max_duration_sec=z.max_duration_sec,
-        active=z.active,
-    )
+    return _zone_response(detector.zones[zone_id])
 
 
 @router.post("/zones", response_model=ZoneResponse)
@@ -244,14 +262,7 @@ async def create_zone(zone: ZoneCreate):
     except Exception:
         pass
     
-    return ZoneResponse(
-        zone_id=new_zone.zone_id,
-        name=new_zone.name,
-        polygon=[list(p) for p in new_zone.polygon],
-        zone_type=new_zone.zone_type.value,
-        max_duration_sec=new_zone.max_duration_sec,
-        active=new_zone.active,
-    )
+    return _zone_response(new_zone)
 
 
 @router.delete("/zones/{zone_id}")
@@ -310,10 +321,7 @@ async def list_violations(
     # Limit results
     violations = violations[:limit]
     
-    return [
-        ViolationResponse(**v.to_dict())
-        for v in violations
-    ]
+    return [v.to_dict() for v in violations]
 
 
 @router.get("/violations/active", response_model=List[ViolationResponse])
@@ -325,7 +333,7 @@ async def list_active_violations():
     except Exception:
         detector = await get_detector()
         violations = detector.get_active_violations()
-    return [ViolationResponse(**v.to_dict()) for v in violations]
+    return [v.to_dict() for v in violations]
 
 
 @router.get("/violations/{violation_id}", response_model=ViolationResponse)
@@ -334,13 +342,13 @@ async def get_violation(violation_id: str):
     try:
         v = await db_get_violation(violation_id)
         if v:
-            return ViolationResponse(**v.to_dict())
+            return v.to_dict()
     except Exception:
         pass
     detector = await get_detector()
     for v in detector.get_all_violations():
         if v.violation_id == violation_id:
-            return ViolationResponse(**v.to_dict())
+            return v.to_dict()
     
     raise HTTPException(status_code=404, detail=f"Violation not found: {violation_id}")
 
@@ -8,10 +8,15 @@ Sprint G (Revision): Uses "Zoom" detection pipeline:
 """
 
 import asyncio
+import json
+import shutil
+import subprocess
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, Optional
 from datetime import datetime
+from dataclasses import dataclass
 
 import cv2
 from fastapi import APIRouter, HTTPException, BackgroundTasks
@@ -24,6 +29,7 @@ from app.services.detection import (
     detect_and_track,
     draw_detections,
     draw_frame_info,
+    open_capture,
     FrameResult,
     VEHICLE_CLASSES,
 )
@@ -32,39 +38,98 @@ from app.api.parking import get_detector  # import parking detector to overlay z
 settings = get_settings()
 router = APIRouter(prefix="/video", tags=["Video"])
 
-# Global state for pipeline control
-_pipeline_state = {
-    "running": False,
-    "video_source": None,
-    "model": None,
-    "plate_model": None,
-    "frames_processed": 0,
-    "total_detections": 0,
-    "plates_detected": 0,
-    "start_time": None,
-    "last_frame_time": None,
-}
+# JPEG quality for streamed MJPEG frames
+JPEG_QUALITY: int = 80
+
+# Lazy load PyTurboJPEG (SIMD libjpeg-turbo); falls back to cv2.imencode
+_jpeg_encoder = None
+_jpeg_encoder_checked = False
+
+
+def get_jpeg_encoder():
+    """Get the TurboJPEG encoder if available (lazy loading)."""
+    global _jpeg_encoder, _jpeg_encoder_checked
+    if not _jpeg_encoder_checked:
+        _jpeg_encoder_checked = True
+        try:
+            from turbojpeg import TurboJPEG
+            _jpeg_encoder = TurboJPEG()
+            print("✅ TurboJPEG encoder loaded")
+        except Exception as e:
+            # ImportError, or the libturbojpeg shared library is missing
+            print(f"⚠️ TurboJPEG not available, using cv2.imencode: {e}")
+    return _jpeg_encoder
+
+
+# Multipart framing around each JPEG in the MJPEG stream
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MJPEG_PART_TRAILER = b'\r\n'
+
+
+def encode_jpeg(frame, quality: int = JPEG_QUALITY):
+    """
+    Encode a BGR frame to JPEG.
+    
+    Returns a bytes-like object (bytes, or the uint8 ndarray from
+    cv2.imencode) so callers can assemble output without an extra copy.
+    """
+    encoder = get_jpeg_encoder()
+    if encoder is not None:
+        return encoder.encode(frame, quality=quality)
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer
+
+
+def encode_stream_frame(frame, scale: float = 0.75) -> bytes:
+    """Downscale a frame (reduce bandwidth) and encode it as one MJPEG part."""
+    frame = cv2.resize(frame, None, fx=scale, fy=scale)
+    # Single copy of the JPEG into the part, instead of tobytes() + two concats
+    return b''.join((MJPEG_PART_HEADER, encode_jpeg(frame), MJPEG_PART_TRAILER))
+
+@dataclass(slots=True)
+class PipelineState:
+    """Global state for pipeline control."""
+    running: bool = False
+    video_source: Optional[str] = None
+    model: Optional[str] = None
+    plate_model: Optional[str] = None
+    frames_processed: int = 0
+    total_detections: int = 0
+    plates_detected: int = 0
+    start_time: Optional[float] = None
+    last_frame_time: Optional[float] = None
+
+
+_pipeline_state = PipelineState()
 
 
 def get_pipeline_state() -> dict:
     """Get current pipeline state."""
-    state = _pipeline_state.copy()
-    if state["start_time"]:
-        state["uptime_seconds"] = time.time() - state["start_time"]
-    return state
+    state = _pipeline_state
+    return {
+        "running": state.running,
+        "video_source": state.video_source,
+        "model": state.model,
+        "plate_model": state.plate_model,
+        "frames_processed": state.frames_processed,
+        "total_detections": state.total_detections,
+        "plates_detected": state.plates_detected,
+        "start_time": state.start_time,
+        "last_frame_time": state.last_frame_time,
+        "uptime_seconds": time.time() - state.start_time if state.start_time else 0,
+    }
 
 
 def reset_pipeline_state():
     """Reset pipeline state."""
-    _pipeline_state.update({
-        "running": False,
-        "video_source": None,
-        "frames_processed": 0,
-        "total_detections": 0,
-        "plates_detected": 0,
-        "start_time": None,
-        "last_frame_time": None,
-    })
+    state = _pipeline_state
+    state.running = False
+    state.video_source = None
+    state.frames_processed = 0
+    state.total_detections = 0
+    state.plates_detected = 0
+    state.start_time = None
+    state.last_frame_time = None
 
 
 async def generate_mjpeg_frames(
@@ -94,32 +159,33 @@ async def generate_mjpeg_frames(
     confidence = confidence or settings.detection_confidence
     min_frame_time = 1.0 / max_fps
     
-    # Open video
-    cap = cv2.VideoCapture(video_path)
+    # Open video (GPU decode when the FFmpeg build supports it)
+    cap = open_capture(video_path)
     if not cap.isOpened():
         raise HTTPException(status_code=404, detail=f"Cannot open video: {video_path}")
     
     # Load models using new two-stage API
     vehicle_model = load_vehicle_model("cpu")
-    _pipeline_state["model"] = settings.vehicle_model
+    _pipeline_state.model = settings.vehicle_model
     
     # Load plate model if requested
     plate_model = None
     if detect_plates_flag:
         plate_model = load_plate_model("cpu")
-        _pipeline_state["plate_model"] = settings.plate_model
+        _pipeline_state.plate_model = settings.plate_model
     
     video_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     
-    _pipeline_state["running"] = True
-    _pipeline_state["video_source"] = video_path
-    _pipeline_state["start_time"] = time.time()
+    _pipeline_state.running = True
+    _pipeline_state.video_source = video_path
+    _pipeline_state.start_time = time.time()
     
     frame_idx = 0
+    loop = asyncio.get_running_loop()
     
     try:
-        while _pipeline_state["running"]:
+        while _pipeline_state.running:
             frame_start = time.time()
             
             ret, frame = cap.read()
@@ -143,10 +209,10 @@ async def generate_mjpeg_frames(
                         run_plate_detection=detect_plates_flag,
                     )
                     
-                    _pipeline_state["frames_processed"] += 1
-                    _pipeline_state["total_detections"] += len(result.detections)
-                    _pipeline_state["plates_detected"] += len(result.plate_boxes)
-                    _pipeline_state["last_frame_time"] = time.time()
+                    _pipeline_state.frames_processed += 1
+                    _pipeline_state.total_detections += len(result.detections)
+                    _pipeline_state.plates_detected += len(result.plate_boxes)
+                    _pipeline_state.last_frame_time = time.time()
                     
                     # Draw parking zones overlay (if available)
                     # Skip parking zones for now to avoid blocking
@@ -163,20 +229,12 @@ async def generate_mjpeg_frames(
                     # Add frame info overlay
                     frame = draw_frame_info(frame, result)
                 
-                # Resize for streaming (reduce bandwidth)
-                scale = 0.75
-                frame = cv2.resize(frame, None, fx=scale, fy=scale)
-                
-                # Encode to JPEG
-                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+                # Resize + encode in a worker thread (OpenCV releases the GIL)
+                # so the event loop keeps serving other requests meanwhile
+                part = await loop.run_in_executor(None, encode_stream_frame, frame)
                 
                 # Yield as multipart MJPEG frame
-                yield (
-                    b'--frame\r\n'
-                    b'Content-Type: image/jpeg\r\n\r\n' + 
-                    buffer.tobytes() + 
-                    b'\r\n'
-                )
+                yield part
             
             frame_idx += 1
             
@@ -184,12 +242,93 @@ async def generate_mjpeg_frames(
             elapsed = time.time() - frame_start
             if elapsed < min_frame_time:
                 await asyncio.sleep(min_frame_time - elapsed)
+            else:
+                # Backpressure: detection or the client fell behind, so drop the
+                # frames we had no time for instead of letting latency build up.
+                # grab() advances the stream without decoding into an ndarray.
+                frames_behind = min(int(elapsed / min_frame_time) - 1, int(max_fps))
+                for _ in range(frames_behind):
+                    if not cap.grab():
+                        break
+                    frame_idx += 1
                 
     finally:
         cap.release()
         reset_pipeline_state()
 
 
+class FrameBroker:
+    """
+    Runs a single decode/detect/encode loop and shares its output.
+    
+    Every client streaming the same source with the same options reads the
+    latest encoded MJPEG part from here, so detection cost does not scale
+    with the number of viewers. Slow clients simply skip to the newest frame.
+    """
+    
+    def __init__(self, key: tuple, frames: AsyncIterator[bytes]):
+        self.key = key
+        self.latest: Optional[bytes] = None
+        self.seq = 0
+        self.done = False
+        self.clients = 0
+        self._frames = frames
+        self._new_frame = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def _publish(self, part: Optional[bytes]):
+        """Store a new frame (None = end of stream) and wake all clients."""
+        if part is None:
+            self.done = True
+        else:
+            self.latest = part
+            self.seq += 1
+        event, self._new_frame = self._new_frame, asyncio.Event()
+        event.set()
+    
+    def _release(self):
+        """Unregister this broker so new clients start a fresh one."""
+        if _frame_brokers.get(self.key) is self:
+            del _frame_brokers[self.key]
+    
+    async def _run(self):
+        """Background task: pull frames from the pipeline and publish them."""
+        try:
+            async for part in self._frames:
+                self._publish(part)
+        except HTTPException as e:
+            print(f"⚠️ Stream stopped: {e.detail}")
+        finally:
+            self._release()
+            self._publish(None)
+    
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        """Yield each new frame to one client until the stream ends."""
+        self.clients += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        last_seq = 0
+        try:
+            while True:
+                if self.seq == last_seq:
+                    if self.done:
+                        break
+                    await self._new_frame.wait()
+                    continue
+                last_seq = self.seq
+                yield self.latest
+        finally:
+            self.clients -= 1
+            if self.clients == 0 and not self._task.done():
+                # Last viewer left: stop decoding
+                self._release()
+                self._task.cancel()
+
+
+# Active brokers keyed by (source, skip, confidence, detections, detect_plates)
+_frame_brokers: Dict[tuple, FrameBroker] = {}
+
+
 @router.get("/stream")
 async def stream_video(
     source: str = None,
@@ -227,14 +366,24 @@ async def stream_video(
         else:
             raise HTTPException(status_code=404, detail=f"Video not found: {source}")
     
+    # Share one pipeline between all clients requesting the same stream
+    key = (source, skip, confidence, detections, detect_plates)
+    broker = _frame_brokers.get(key)
+    if broker is None:
+        broker = FrameBroker(
+            key,
+            generate_mjpeg_frames(
+                source,
+                frame_skip=skip,
+                confidence=confidence,
+                show_detections=detections,
+                detect_plates_flag=detect_plates,
+            ),
+        )
+        _frame_brokers[key] = broker
+    
     return StreamingResponse(
-        generate_mjpeg_frames(
-            source,
-            frame_skip=skip,
-            confidence=confidence,
-            show_detections=detections,
-            detect_plates_flag=detect_plates,
-        ),
+        broker.subscribe(),
         media_type="multipart/x-mixed-replace; boundary=frame",
     )
 
@@ -242,17 +391,17 @@ async def stream_video(
 @router.get("/status")
 async def get_stream_status():
     """Get current video streaming status."""
-    state = get_pipeline_state()
+    state = _pipeline_state
     
     return {
-        "running": state["running"],
-        "video_source": state["video_source"],
-        "model": state["model"],
-        "frames_processed": state["frames_processed"],
-        "total_detections": state["total_detections"],
-        "uptime_seconds": state.get("uptime_seconds", 0),
+        "running": state.running,
+        "video_source": state.video_source,
+        "model": state.model,
+        "frames_processed": state.frames_processed,
+        "total_detections": state.total_detections,
+        "uptime_seconds": time.time() - state.start_time if state.start_time else 0,
         "avg_detections_per_frame": (
-            state["total_detections"] / max(state["frames_processed"], 1)
+            state.total_detections / max(state.frames_processed, 1)
         ),
     }
 
@@ -260,13 +409,70 @@ async def get_stream_status():
 @router.post("/stop")
 async def stop_stream():
     """Stop the current video stream."""
-    if not _pipeline_state["running"]:
+    if not _pipeline_state.running:
         return {"status": "not_running", "message": "No stream is currently active"}
     
-    _pipeline_state["running"] = False
+    _pipeline_state.running = False
     return {"status": "stopping", "message": "Stream stop requested"}
 
 
+_FFPROBE = shutil.which("ffprobe")
+
+
+def _probe_with_ffprobe(path: str) -> Optional[dict]:
+    """Read video stream metadata with ffprobe (no codec initialization)."""
+    proc = subprocess.run(
+        [
+            _FFPROBE, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=width,height,avg_frame_rate,nb_frames",
+            "-of", "json", path,
+        ],
+        capture_output=True,
+        timeout=10,
+    )
+    if proc.returncode != 0:
+        return None
+    streams = json.loads(proc.stdout or b"{}").get("streams") or []
+    if not streams or not str(streams[0].get("nb_frames", "")).isdigit():
+        return None  # e.g. mkv/webm containers don't store a frame count
+    stream = streams[0]
+    num, _, den = stream.get("avg_frame_rate", "0/1").partition("/")
+    fps = float(num) / float(den) if den and float(den) else 0.0
+    return {
+        "fps": fps,
+        "frames": int(stream["nb_frames"]),
+        "width": int(stream.get("width", 0)),
+        "height": int(stream.get("height", 0)),
+    }
+
+
+@lru_cache(maxsize=64)
+def _probe_video(path: str, mtime: float) -> dict:
+    """
+    Get video metadata, cached per (path, mtime) so edits invalidate the entry.
+    
+    Uses ffprobe when installed, otherwise opens the file with cv2.VideoCapture.
+    """
+    if _FFPROBE:
+        try:
+            info = _probe_with_ffprobe(path)
+            if info is not None:
+                return info
+        except (subprocess.SubprocessError, ValueError):
+            pass
+    
+    cap = cv2.VideoCapture(path)
+    try:
+        return {
+            "fps": cap.get(cv2.CAP_PROP_FPS),
+            "frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        }
+    finally:
+        cap.release()
+
+
 @router.get("/list")
 async def list_videos():
     """List available video files in the data directory."""
@@ -278,16 +484,12 @@ async def list_videos():
     videos = []
     for ext in ["*.mp4", "*.avi", "*.mkv", "*.webm"]:
         for f in video_dir.glob(ext):
-            cap = cv2.VideoCapture(str(f))
+            stat = f.stat()
             videos.append({
                 "name": f.name,
                 "path": str(f),
-                "size_mb": round(f.stat().st_size / (1024 * 1024), 2),
-                "fps": cap.get(cv2.CAP_PROP_FPS),
-                "frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
-                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-                "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                "size_mb": round(stat.st_size / (1024 * 1024), 2),
+                **_probe_video(str(f), stat.st_mtime),
             })
-            cap.release()
     
     return {"videos": videos}
@@ -28,6 +28,9 @@ class Settings(BaseSettings):
     # --- YOLOv8 Models ---
     vehicle_model: str = "yolov8n.pt"  # Pretrained for vehicle detection + tracking
     plate_model: str = "best_plate.pt"  # Custom-trained for license plate detection
+    model_precision: str = "fp32"  # fp32 | fp16 | int8 (fp16/int8 export to TensorRT on CUDA)
+    plate_model_precision: str = ""  # Override for the plate model (e.g. int8); empty = model_precision
+    int8_calibration_data: str = ""  # Dataset YAML of sample frames for INT8 calibration
     
     # --- Detection Settings ---
     detection_confidence: float = 0.5
@@ -4,7 +4,9 @@ Creates tables for `zones`, `violations`, and `drivers` and provides helper CRUD
 """
 import asyncio
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import aiosqlite
@@ -70,17 +72,44 @@ DB_SCHEMA = {
 }
 
 
+# Buffered writes are committed together once this many are pending...
+WRITE_BATCH_SIZE = 32
+# ...or after this long, whichever comes first
+WRITE_BATCH_SECONDS = 1.0
+# A write that keeps failing is dropped after this many flush attempts
+WRITE_MAX_ATTEMPTS = 3
+# Buffer bound while the DB is unreachable; the oldest writes are dropped beyond it
+WRITE_BUFFER_MAX = 10_000
+
+
+@asynccontextmanager
+async def _connect(db_path: str):
+    """
+    Open a connection tuned for the WAL journal set up in init_db.
+    
+    synchronous=NORMAL only fsyncs at checkpoints in WAL mode, instead of on
+    every commit, and stays crash-consistent.
+    """
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("PRAGMA synchronous = NORMAL;")
+        yield db
+
 
 async def init_db(db_path: Optional[str] = None):
     """Initialize the SQLite DB and create required tables."""
+    global _write_loop
+    # The server loop: queue_write hands writes from other threads to it
+    _write_loop = asyncio.get_running_loop()
     if db_path is None:
         db_path = str(settings.db_path)
     path = Path(db_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         # Enable foreign keys (future tables may use them)
         await db.execute("PRAGMA foreign_keys = ON;")
+        # Write-ahead log: readers don't block the writer and commits are cheap
+        await db.execute("PRAGMA journal_mode = WAL;")
         for name, sql in DB_SCHEMA.items():
             await db.execute(sql)
         await db.commit()
@@ -90,7 +119,7 @@ async def init_db(db_path: Optional[str] = None):
 async def insert_zone(zone: ParkingZone, db_path: Optional[str] = None):
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
             "INSERT OR REPLACE INTO zones (zone_id, name, polygon, zone_type, max_duration_sec, color, active) VALUES (?, ?, ?, ?, ?, ?, ?)",
             (
@@ -110,7 +139,7 @@ async def list_zones(db_path: Optional[str] = None) -> List[ParkingZone]:
     if db_path is None:
         db_path = str(settings.db_path)
     zones = []
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute("SELECT zone_id, name, polygon, zone_type, max_duration_sec, color, active FROM zones") as cursor:
             async for row in cursor:
                 zone_id, name, polygon_json, zone_type, max_duration_sec, color_json, active = row
@@ -138,33 +167,42 @@ async def list_zones(db_path: Optional[str] = None) -> List[ParkingZone]:
 async def delete_zone(zone_id: str, db_path: Optional[str] = None) -> bool:
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute("DELETE FROM zones WHERE zone_id = ?", (zone_id,))
         await db.commit()
         return True
 
 
 # --------------------- Violations ---------------------
+INSERT_VIOLATION_SQL = (
+    "INSERT OR REPLACE INTO violations (violation_id, track_id, zone_id, zone_name, zone_type, start_time, end_time, duration_sec, license_plate, snapshot_path, fine_amount, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def violation_params(v: ParkingViolation) -> tuple:
+    return (
+        v.violation_id,
+        v.track_id,
+        v.zone_id,
+        v.zone_name,
+        v.zone_type.value if v.zone_type else None,
+        v.start_time,
+        v.end_time,
+        v.duration_sec,
+        v.license_plate,
+        v.snapshot_path,
+        v.fine_amount,
+        v.status,
+    )
+
+
 async def insert_violation(v: ParkingViolation, db_path: Optional[str] = None):
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
-            "INSERT OR REPLACE INTO violations (violation_id, track_id, zone_id, zone_name, zone_type, start_time, end_time, duration_sec, license_plate, snapshot_path, fine_amount, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                v.violation_id,
-                v.track_id,
-                v.zone_id,
-                v.zone_name,
-                v.zone_type.value if v.zone_type else None,
-                v.start_time,
-                v.end_time,
-                v.duration_sec,
-                v.license_plate,
-                v.snapshot_path,
-                v.fine_amount,
-                v.status,
-            ),
+            INSERT_VIOLATION_SQL,
+            violation_params(v),
         )
         await db.commit()
 
@@ -173,7 +211,7 @@ async def list_violations(limit: int = 100, db_path: Optional[str] = None) -> Li
     if db_path is None:
         db_path = str(settings.db_path)
     violations: List[ParkingViolation] = []
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute("SELECT violation_id, track_id, zone_id, zone_name, zone_type, start_time, end_time, duration_sec, license_plate, snapshot_path, fine_amount, status FROM violations ORDER BY start_time DESC LIMIT ?", (limit,)) as cursor:
             async for row in cursor:
                 violation_id, track_id, zone_id, zone_name, zone_type, start_time, end_time, duration_sec, license_plate, snapshot_path, fine_amount, status = row
@@ -203,7 +241,7 @@ async def list_violations(limit: int = 100, db_path: Optional[str] = None) -> Li
 async def get_violation(violation_id: str, db_path: Optional[str] = None) -> Optional[ParkingViolation]:
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute("SELECT violation_id, track_id, zone_id, zone_name, zone_type, start_time, end_time, duration_sec, license_plate, snapshot_path, fine_amount, status FROM violations WHERE violation_id = ?", (violation_id,)) as cursor:
             row = await cursor.fetchone()
             if not row:
@@ -232,7 +270,7 @@ async def get_violation(violation_id: str, db_path: Optional[str] = None) -> Opt
 async def update_violation_status(violation_id: str, status: str = "resolved", end_time: float = None, db_path: Optional[str] = None):
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
             "UPDATE violations SET status = ?, end_time = ? WHERE violation_id = ?",
             (status, end_time, violation_id),
@@ -241,6 +279,11 @@ async def update_violation_status(violation_id: str, status: str = "resolved", e
 
 
 # --------------------- Drivers ---------------------
+INSERT_DRIVER_SQL = (
+    "INSERT OR REPLACE INTO drivers (driver_id, current_score, total_violations, total_fines, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
 async def insert_driver(driver_id: str, current_score: int = 100, total_violations: int = 0,
                         total_fines: float = 0.0, created_at: float = None, updated_at: float = None,
                         db_path: Optional[str] = None):
@@ -253,9 +296,9 @@ async def insert_driver(driver_id: str, current_score: int = 100, total_violatio
         created_at = now
     if updated_at is None:
         updated_at = now
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
-            "INSERT OR REPLACE INTO drivers (driver_id, current_score, total_violations, total_fines, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            INSERT_DRIVER_SQL,
             (driver_id, current_score, total_violations, total_fines, created_at, updated_at),
         )
         await db.commit()
@@ -265,7 +308,7 @@ async def get_driver(driver_id: str, db_path: Optional[str] = None) -> Optional[
     """Get a driver by ID."""
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute(
             "SELECT driver_id, current_score, total_violations, total_fines, created_at, updated_at FROM drivers WHERE driver_id = ?",
             (driver_id,)
@@ -295,7 +338,7 @@ async def list_drivers(limit: int = 100, order_by: str = "current_score", ascend
         order_by = "current_score"
     
     drivers = []
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         query = f"SELECT driver_id, current_score, total_violations, total_fines, created_at, updated_at FROM drivers ORDER BY {order_by} {order} LIMIT ?"
         async with db.execute(query, (limit,)) as cursor:
             async for row in cursor:
@@ -316,7 +359,7 @@ async def update_driver_score(driver_id: str, current_score: int, total_violatio
     import time
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
             "UPDATE drivers SET current_score = ?, total_violations = ?, total_fines = ?, updated_at = ? WHERE driver_id = ?",
             (current_score, total_violations, total_fines, time.time(), driver_id),
@@ -328,7 +371,7 @@ async def delete_driver(driver_id: str, db_path: Optional[str] = None) -> bool:
     """Delete a driver and their violation records."""
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute("DELETE FROM driver_violations WHERE driver_id = ?", (driver_id,))
         await db.execute("DELETE FROM drivers WHERE driver_id = ?", (driver_id,))
         await db.commit()
@@ -339,13 +382,18 @@ async def get_driver_count(db_path: Optional[str] = None) -> int:
     """Get total count of drivers."""
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute("SELECT COUNT(*) FROM drivers") as cursor:
             row = await cursor.fetchone()
             return row[0] if row else 0
 
 
 # --------------------- Driver Violations ---------------------
+INSERT_DRIVER_VIOLATION_SQL = (
+    "INSERT OR REPLACE INTO driver_violations (violation_id, driver_id, violation_type, timestamp, location, points_deducted, fine_amount, license_plate, snapshot_path, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
 async def insert_driver_violation(violation_id: str, driver_id: str, violation_type: str,
                                    timestamp: float, location: str = None, points_deducted: int = 0,
                                    fine_amount: float = 0.0, license_plate: str = None,
@@ -354,9 +402,9 @@ async def insert_driver_violation(violation_id: str, driver_id: str, violation_t
     """Insert a driver violation record."""
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         await db.execute(
-            "INSERT OR REPLACE INTO driver_violations (violation_id, driver_id, violation_type, timestamp, location, points_deducted, fine_amount, license_plate, snapshot_path, notes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            INSERT_DRIVER_VIOLATION_SQL,
             (violation_id, driver_id, violation_type, timestamp, location, points_deducted, fine_amount, license_plate, snapshot_path, notes),
         )
         await db.commit()
@@ -367,7 +415,7 @@ async def list_driver_violations(driver_id: str, limit: int = 50, db_path: Optio
     if db_path is None:
         db_path = str(settings.db_path)
     violations = []
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         async with db.execute(
             "SELECT violation_id, driver_id, violation_type, timestamp, location, points_deducted, fine_amount, license_plate, snapshot_path, notes FROM driver_violations WHERE driver_id = ? ORDER BY timestamp DESC LIMIT ?",
             (driver_id, limit)
@@ -392,7 +440,7 @@ async def get_driver_statistics(db_path: Optional[str] = None) -> Dict[str, Any]
     """Get overall driver statistics."""
     if db_path is None:
         db_path = str(settings.db_path)
-    async with aiosqlite.connect(db_path) as db:
+    async with _connect(db_path) as db:
         # Total drivers
         async with db.execute("SELECT COUNT(*) FROM drivers") as cursor:
             total_drivers = (await cursor.fetchone())[0]
@@ -449,6 +497,192 @@ async def get_driver_statistics(db_path: Optional[str] = None) -> Dict[str, Any]
         }
 
 
+# --------------------- Batched writes ---------------------
+_pending_writes: List[Tuple[str, tuple, int]] = []  # (sql, params, failed attempts)
+_write_lock = threading.Lock()  # guards _pending_writes across threads
+_write_loop: Optional[asyncio.AbstractEventLoop] = None  # loop init_db ran on
+_write_flush: Optional[asyncio.Handle] = None  # pending flush callback, if any
+_writes_dropped = 0
+_flush_tasks: set = set()  # running background flushes (referenced until done)
+
+
+async def execute_batch(statements: List[Tuple[str, tuple]], db_path: Optional[str] = None):
+    """Run several write statements in a single transaction (one commit)."""
+    if not statements:
+        return
+    if db_path is None:
+        db_path = str(settings.db_path)
+    async with _connect(db_path) as db:
+        for sql, params in statements:
+            await db.execute(sql, params)
+        await db.commit()
+
+
+async def _execute_each(
+    statements: List[Tuple[str, tuple, int]],
+    db_path: Optional[str] = None,
+) -> List[Tuple[Tuple[str, tuple, int], Exception]]:
+    """Commit statements one at a time; return the ones that failed with their errors."""
+    if db_path is None:
+        db_path = str(settings.db_path)
+    failed = []
+    remaining = list(statements)
+    try:
+        async with _connect(db_path) as db:
+            while remaining:
+                stmt = remaining.pop(0)
+                try:
+                    await db.execute(stmt[0], stmt[1])
+                    await db.commit()
+                except Exception as e:
+                    failed.append((stmt, e))
+                    await db.rollback()
+    except Exception as e:
+        # Lost the connection: nothing after this point was committed
+        failed += [(stmt, e) for stmt in remaining]
+    return failed
+
+
+async def flush_writes(db_path: Optional[str] = None):
+    """
+    Commit every buffered write now.
+    
+    Writes normally go in one transaction. If that fails, they are retried
+    one at a time so a single bad statement can't hold back the rest. Writes
+    that still fail go back to the front of the buffer for the next flush,
+    up to WRITE_MAX_ATTEMPTS, and are then logged and dropped. Raises the
+    last error if anything failed.
+    
+    Called from a loop other than the server loop, the flush runs on the
+    server loop (which owns the flush timer) and this waits for it.
+    """
+    global _write_flush
+    home = _home_loop()
+    if home is not None and home is not asyncio.get_running_loop():
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(flush_writes(db_path), home))
+        return
+    
+    # Let background flushes already in flight finish first, so "now"
+    # includes them (e.g. the final flush at shutdown)
+    in_flight = [t for t in _flush_tasks if t is not asyncio.current_task()]
+    if in_flight and asyncio.current_task() not in _flush_tasks:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    if _write_flush is not None:
+        _write_flush.cancel()
+        _write_flush = None
+    with _write_lock:
+        statements = _pending_writes[:]
+        _pending_writes.clear()
+    try:
+        await execute_batch([(sql, params) for sql, params, _ in statements], db_path)
+        return
+    except Exception:
+        pass
+    
+    failed = await _execute_each(statements, db_path)
+    if not failed:
+        return
+    
+    retry = []
+    for (sql, params, attempts), error in failed:
+        if attempts + 1 >= WRITE_MAX_ATTEMPTS:
+            print(f"❌ Dropping DB write after {attempts + 1} attempts: {error} | {sql.split('(')[0].strip()} {params}")
+        else:
+            retry.append((sql, params, attempts + 1))
+    # Requeue ahead of anything buffered while the commit was running
+    with _write_lock:
+        _pending_writes[:0] = retry
+        _trim_pending_writes()
+    raise failed[-1][1]
+
+
+def _home_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The server loop recorded by init_db, if it is still running."""
+    loop = _write_loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return None
+    return loop
+
+
+def _trim_pending_writes():
+    """Drop the oldest buffered writes beyond WRITE_BUFFER_MAX (call with _write_lock held)."""
+    global _writes_dropped
+    excess = len(_pending_writes) - WRITE_BUFFER_MAX
+    if excess > 0:
+        del _pending_writes[:excess]
+        _writes_dropped += excess
+        print(f"⚠️ DB write buffer full, dropped {excess} oldest writes ({_writes_dropped} total)")
+
+
+async def _flush_in_background():
+    """Scheduled flush: log failures and retry later instead of raising."""
+    global _write_flush
+    try:
+        await flush_writes()
+    except Exception as e:
+        print(f"⚠️ Batched DB write failed ({len(_pending_writes)} pending): {e}")
+        if _pending_writes and _write_flush is None:
+            loop = asyncio.get_running_loop()
+            _write_flush = loop.call_later(WRITE_BATCH_SECONDS, _start_flush, loop)
+
+
+def _start_flush(loop: asyncio.AbstractEventLoop):
+    """Loop callback that starts a background flush and keeps its task referenced."""
+    task = loop.create_task(_flush_in_background())
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+def _buffer_write(sql: str, params: tuple, loop: asyncio.AbstractEventLoop):
+    """Add a write to the buffer and schedule its flush. Runs on `loop`."""
+    global _write_flush
+    with _write_lock:
+        _pending_writes.append((sql, params, 0))
+        _trim_pending_writes()
+        pending = len(_pending_writes)
+    
+    if pending >= WRITE_BATCH_SIZE:
+        # Batch full: flush on the next loop iteration instead of waiting
+        if _write_flush is not None:
+            _write_flush.cancel()
+        _write_flush = loop.call_soon(_start_flush, loop)
+    elif _write_flush is None:
+        _write_flush = loop.call_later(WRITE_BATCH_SECONDS, _start_flush, loop)
+
+
+def queue_write(sql: str, params: tuple):
+    """
+    Buffer a write statement for a batched commit.
+    
+    Violations arrive in bursts (several cars at one intersection), so
+    buffered writes are committed together once WRITE_BATCH_SIZE are pending
+    or WRITE_BATCH_SECONDS have passed. Failed writes are retried on later
+    flushes (see flush_writes).
+    
+    Safe to call from any thread: off the server loop (e.g. a detection
+    worker) the write is handed to that loop with call_soon_threadsafe and
+    joins the same batches. Only when no loop is running anywhere (plain
+    scripts) is the write committed on its own, right away.
+    """
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    
+    home = _home_loop()
+    if home is not None and home is not current:
+        try:
+            home.call_soon_threadsafe(_buffer_write, sql, params, home)
+            return
+        except RuntimeError:
+            pass  # server loop closed in the meantime
+    
+    if current is not None:
+        _buffer_write(sql, params, current)
+    else:
+        asyncio.run(execute_batch([(sql, params)]))
+
 
 # A helper to run a coroutine in case it's called from sync callback
 def schedule_coroutine(coro):
@@ -465,6 +699,13 @@ def schedule_coroutine(coro):
 
 __all__ = [
     "init_db",
+    "execute_batch",
+    "flush_writes",
+    "queue_write",
+    "INSERT_VIOLATION_SQL",
+    "INSERT_DRIVER_SQL",
+    "INSERT_DRIVER_VIOLATION_SQL",
+    "violation_params",
     "insert_zone",
     "list_zones",
     "delete_zone",
@@ -5,7 +5,7 @@ Main entry point with health checks, SSE endpoints, and API routing
 
 import asyncio
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional, Set
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -18,13 +18,33 @@ from app.core.config import get_settings
 from app.api.video import router as video_router
 from app.api.parking import router as parking_router
 from app.api.scoring import router as scoring_router
-from app.core.database import init_db
+from app.core.database import init_db, flush_writes
+
+# orjson-backed responses when available (C serializer, much faster than stdlib json)
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+    DefaultJSONResponse = JSONResponse
+
+    def json_dumps(obj) -> str:
+        return json.dumps(obj)
 
 settings = get_settings()
 
-# --- Event Queue for SSE ---
-# Simple in-memory queue for broadcasting events to connected clients
-event_queue: asyncio.Queue = asyncio.Queue()
+# --- SSE Subscribers ---
+# One bounded queue per connected client, so every client receives every event
+SSE_QUEUE_MAXSIZE: int = 100
+# Detection events arriving within this window are sent as a single event
+DETECTION_COALESCE_SECONDS: float = 0.05
+
+_subscribers: Set[asyncio.Queue] = set()
+_pending_detections: List[dict] = []
+_detection_flush: Optional[asyncio.TimerHandle] = None
 
 
 @asynccontextmanager
@@ -48,6 +68,10 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("🛑 Shutting down...")
+    try:
+        await flush_writes()
+    except Exception as e:
+        print(f"⚠️ Failed to flush pending DB writes: {e}")
 
 
 # --- FastAPI App ---
@@ -56,6 +80,7 @@ app = FastAPI(
     version=settings.app_version,
     description="AI-powered traffic management with violation detection, driver scoring, and adaptive signals",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # --- CORS Middleware (allow Flutter web app) ---
@@ -151,7 +176,9 @@ async def version_info():
 # =============================================================================
 
 async def event_generator(request: Request) -> AsyncGenerator[dict, None]:
-    """Generate SSE events from the event queue."""
+    """Generate SSE events from this client's subscriber queue."""
+    event_queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+    _subscribers.add(event_queue)
     try:
         while True:
             # Check if client disconnected
@@ -161,19 +188,22 @@ async def event_generator(request: Request) -> AsyncGenerator[dict, None]:
             try:
                 # Wait for events with timeout to allow disconnect checks
                 event = await asyncio.wait_for(event_queue.get(), timeout=1.0)
+                # Serialize payloads ourselves; sse-starlette would str() the dict
                 yield {
                     "event": event.get("type", "message"),
-                    "data": event.get("data", {}),
+                    "data": json_dumps(event.get("data", {})),
                     "retry": settings.sse_retry_timeout,
                 }
             except asyncio.TimeoutError:
                 # Send keepalive ping
                 yield {
                     "event": "ping",
-                    "data": {"timestamp": datetime.utcnow().isoformat()},
+                    "data": json_dumps({"timestamp": datetime.utcnow().isoformat()}),
                 }
     except asyncio.CancelledError:
         print("SSE client disconnected")
+    finally:
+        _subscribers.discard(event_queue)
 
 
 @app.get("/events", tags=["Real-time"])
@@ -182,7 +212,7 @@ async def sse_events(request: Request):
     Server-Sent Events endpoint for real-time updates.
     
     Event types:
-    - detection: New vehicle/object detected
+    - detection: New vehicles/objects detected (batched as {"detections": [...]})
     - violation: Parking or traffic violation detected  
     - score_update: Driver score changed
     - signal_change: Traffic signal state changed
@@ -191,17 +221,53 @@ async def sse_events(request: Request):
     return EventSourceResponse(event_generator(request))
 
 
-async def broadcast_event(event_type: str, data: dict):
-    """Broadcast an event to all connected SSE clients."""
-    await event_queue.put({
-        "type": event_type,
+def _publish(event: dict):
+    """Put an event on every subscriber queue, dropping the oldest when full."""
+    for queue in _subscribers:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+def _flush_detections():
+    """Publish all detection events collected during the coalescing window."""
+    global _detection_flush
+    _detection_flush = None
+    if not _pending_detections:
+        return
+    batch = _pending_detections.copy()
+    _pending_detections.clear()
+    _publish({
+        "type": "detection",
         "data": {
-            **data,
+            "detections": batch,
             "timestamp": datetime.utcnow().isoformat(),
-        }
+        },
     })
 
 
+async def broadcast_event(event_type: str, data: dict):
+    """Broadcast an event to all connected SSE clients."""
+    global _detection_flush
+    if not _subscribers:
+        return
+    
+    payload = {
+        **data,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    
+    # Bursty detection events are coalesced into one event per window
+    if event_type == "detection":
+        _pending_detections.append(payload)
+        if _detection_flush is None:
+            loop = asyncio.get_running_loop()
+            _detection_flush = loop.call_later(DETECTION_COALESCE_SECONDS, _flush_detections)
+        return
+    
+    _publish({"type": event_type, "data": payload})
+
+
 # =============================================================================
 # Pipeline Control Endpoints (Now using video router)
 # =============================================================================
@@ -226,7 +292,7 @@ async def start_pipeline(video_source: str = None):
 async def stop_pipeline():
     """Stop the detection pipeline."""
     from app.api.video import _pipeline_state
-    _pipeline_state["running"] = False
+    _pipeline_state.running = False
     await broadcast_event("pipeline", {"status": "stopped"})
     return {"status": "stopped", "message": "Pipeline stop requested"}
 
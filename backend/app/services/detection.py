@@ -6,7 +6,7 @@ Features:
 =========
 1. Two-Stage Detection: Vehicle Tracking → Plate Detection (Zoom)
 2. OCR Caching: Only run OCR every 2+ seconds per vehicle
-3. Frame Skipping: Run YOLO every 2nd frame, reuse boxes on skipped frames
+3. Frame Skipping: Run YOLO every 2nd-8th frame (adaptive), reuse boxes on skipped frames
 4. Speed Estimation: Calculate vehicle speed from centroid movement
 5. Parking Zones: Configurable red zones with warning/violation phases
 6. TTS Warnings: Voice alerts for parking violations
@@ -15,16 +15,29 @@ Features:
 9. Visual Effects: Flashing purple boxes for penalized vehicles
 """
 
+import atexit
+import logging
+import logging.handlers
+import queue
 import sys
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Generator, Optional, List, Dict, Any, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 
 import cv2
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json fallback
+    orjson = None
+    import json
+
 # Add parent to path for imports when running as script
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
@@ -32,13 +45,33 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+# Per-vehicle event logging. Records go through a queue so formatting and the
+# stdout write happen on the listener thread, not the detection thread.
+logger = logging.getLogger("detection")
+if not logger.handlers:
+    logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    logger.propagate = False
+    _log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_stream = logging.StreamHandler(sys.stdout)
+    _log_stream.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
 
 # ============================================================================
 # CONFIGURATION CONSTANTS
 # ============================================================================
 
-# Frame skipping - only run YOLO every N frames
+# Frame skipping - only run YOLO every N frames. N adapts to the scene: it
+# halves (down to the minimum) when vehicles are detected and doubles (up to
+# the maximum) on empty frames, so idle footage costs far fewer inferences.
 YOLO_DETECTION_INTERVAL: int = 2
+YOLO_MAX_DETECTION_INTERVAL: int = 8
+
+# Source id used when a single video stream is processed
+DEFAULT_SOURCE_ID: str = "default"
 
 # Plate detection interval
 PLATE_DETECTION_INTERVAL: int = 3
@@ -46,6 +79,25 @@ PLATE_DETECTION_INTERVAL: int = 3
 # OCR cooldown per vehicle (seconds)
 OCR_COOLDOWN_SECONDS: float = 2.0
 
+# OCR result cache keyed by a difference hash of the plate crop
+OCR_HASH_SIZE: int = 16  # 16x16 gradient bits = 256-bit key
+OCR_CACHE_SIZE: int = 1024
+
+# Reuse a known plate without re-running the plate model while the vehicle
+# box overlaps the box it was found in by more than this (parked vehicles)
+PLATE_REUSE_IOU: float = 0.98
+
+# Stop running the plate model on a vehicle after this many consecutive
+# empty passes, until its box moves (IoU vs. the first miss drops below)
+PLATE_MISS_LIMIT: int = 30
+PLATE_MISS_IOU: float = 0.95
+
+# Plate model inference size. Larger vehicle crops are shrunk to it here;
+# smaller ones are still upscaled to it by Ultralytics' letterbox
+PLATE_CROP_SIZE: int = 320
+# Largest plate batch uploaded through the pinned buffer on CUDA
+PLATE_UPLOAD_MAX_BATCH: int = 32
+
 # Speed estimation (pixels/sec to km/h)
 SPEED_SCALE_FACTOR: float = 0.5
 SPEEDING_THRESHOLD_KMH: float = 80.0
@@ -63,9 +115,22 @@ SIGNAL_UPDATE_INTERVAL: int = 30  # frames (~1 second at 30fps)
 PLATE_HISTORY_MAX_AGE: int = 30
 TRACKING_HISTORY_MAX_AGE: int = 60
 
+# Per-vehicle state bounds (long-running surveillance feeds), per source
+MAX_TRACKED_VEHICLES: int = 4096
+PENALTY_RETENTION_SECONDS: float = 300.0  # forget a penalized vehicle this long after it leaves
+
 # TTS cooldown (don't spam warnings)
 TTS_COOLDOWN_SECONDS: float = 10.0
 
+# Dummy inferences run at model load so the first real frame isn't a cold start
+MODEL_WARMUP_RUNS: int = 2
+MODEL_WARMUP_SIZE: int = 640
+
+# Max batch of the dynamic-shape TensorRT engines (load_model auto-export and
+# scripts/export_engines.py): track_vehicles_batch and batched plate crops
+ENGINE_VEHICLE_BATCH: int = 8
+ENGINE_PLATE_BATCH: int = 16
+
 
 # ============================================================================
 # PARKING ZONES CONFIGURATION
@@ -97,37 +162,143 @@ DEFAULT_PARKING_ZONES = [
 # Model cache
 _model_cache: Dict[str, Any] = {}
 
-# Plate history: track_id -> {"bbox", "text", "timestamp", "frame_count"}
-plate_history: Dict[int, Dict[str, Any]] = {}
+# OCR results by plate-crop dHash (LRU): hash -> plate text or None
+_ocr_hash_cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
 
-# OCR cooldown: track_id -> last_ocr_time
-ocr_cooldown: Dict[int, float] = {}
+# Per-source state (frame skipping, plate boxes, tracked vehicles): source_id -> SourceState
+_sources: Dict[str, "SourceState"] = {}
 
-# Speed tracking: track_id -> {"prev_centroid", "prev_time", "speed", "is_speeding", "speed_pixels"}
-speed_history: Dict[int, Dict[str, Any]] = {}
+# Pinned host + device buffers for plate batches on CUDA: (host, device)
+_plate_upload_buffers: Optional[Tuple[Any, Any]] = None
 
-# Parking tracking: track_id -> {"entry_time", "zone_id", "warned", "penalized", "plate", "tts_time"}
-parking_tracker: Dict[int, Dict[str, Any]] = {}
 
-# Penalized vehicles (for flashing effect)
-penalized_vehicles: Dict[int, float] = {}  # track_id -> penalize_time
+def _with_polygon_array(zone: Dict) -> Dict:
+    """Return a copy of a zone dict with its polygon cached as an int32 array and bounding rect."""
+    polygon_np = np.ascontiguousarray(zone["polygon"], dtype=np.int32).reshape(-1, 2)
+    return {**zone, "polygon_np": polygon_np, "rect": cv2.boundingRect(polygon_np)}
 
-# Previous frame detections (for frame skipping)
-_prev_detections: List[Any] = []
-_prev_plate_boxes: List[Tuple[int, int, int, int]] = []
 
-# Frame counter
-_frame_counter: int = 0
+def _pack_polygons(zones: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate zone polygons into one vertex buffer plus offsets."""
+    polygons = [z["polygon_np"] for z in zones]
+    if not polygons:
+        return np.empty((0, 2), dtype=np.int32), np.zeros(1, dtype=np.int64)
+    return np.concatenate(polygons), np.cumsum([0] + [len(p) for p in polygons])
+
 
 # Parking zones (can be updated at runtime)
-parking_zones: List[Dict] = DEFAULT_PARKING_ZONES.copy()
+parking_zones: List[Dict] = [_with_polygon_array(z) for z in DEFAULT_PARKING_ZONES]
+
+# Packed parking zone geometry for batched lookups (rebuilt with parking_zones)
+_zone_pts, _zone_off = _pack_polygons(parking_zones)
+
+# Zone index raster per frame size: (h, w) -> int16 mask of zone index + 1 (0 = none)
+_zone_mask_cache: Dict[Tuple[int, int], np.ndarray] = {}
 
 
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
+class TrackState:
+    """
+    All state kept for one tracked vehicle.
+    
+    Parking fields are only meaningful while entry_time is set; plate fields
+    while plate_bbox is set. penalized_time survives both (flashing effect).
+    """
+    # Parking timer (cleared when the vehicle leaves the zone)
+    entry_time: Optional[float] = None
+    zone_id: Optional[str] = None
+    warned: bool = False
+    penalized: bool = False
+    plate: Optional[str] = None
+    tts_time: float = 0.0
+    last_seen: float = 0.0
+    # Plate history and OCR cooldown
+    plate_bbox: Optional[Tuple[int, int, int, int]] = None
+    plate_text: Optional[str] = None
+    plate_age: int = 0
+    ocr_last: float = 0.0
+    plate_vehicle_bbox: Optional[Tuple[int, int, int, int]] = None  # vehicle box when plate was found
+    # Consecutive plate-model passes that found nothing, and where they started
+    plate_misses: int = 0
+    plate_miss_bbox: Optional[Tuple[int, int, int, int]] = None
+    # Time the parking penalty was applied
+    penalized_time: Optional[float] = None
+    # Last time the tracker reported this vehicle
+    active_time: float = 0.0
+    
+    def start_parking(self, zone_id: str, current_time: float, plate: Optional[str]):
+        self.entry_time = current_time
+        self.zone_id = zone_id
+        self.warned = False
+        self.penalized = False
+        self.plate = plate
+        self.tts_time = 0.0
+        self.last_seen = current_time
+    
+    def clear_parking(self):
+        self.entry_time = None
+        self.zone_id = None
+        self.warned = False
+        self.penalized = False
+        self.plate = None
+        self.tts_time = 0.0
+    
+    def clear_plate(self):
+        self.plate_bbox = None
+        self.plate_text = None
+        self.plate_age = 0
+        self.ocr_last = 0.0
+        self.plate_vehicle_bbox = None
+    
+    def clear_plate_misses(self):
+        self.plate_misses = 0
+        self.plate_miss_bbox = None
+    
+    def record_plate_miss(self, bbox: Tuple[int, int, int, int]):
+        # Count only while the vehicle stays put; any real movement restarts
+        if self.plate_miss_bbox is None or bbox_iou(bbox, self.plate_miss_bbox) <= PLATE_MISS_IOU:
+            self.plate_misses = 0
+            self.plate_miss_bbox = bbox
+        self.plate_misses += 1
+    
+    @property
+    def is_idle(self) -> bool:
+        return (
+            self.entry_time is None and self.plate_bbox is None
+            and self.penalized_time is None and self.plate_miss_bbox is None
+        )
+
+
+def _get_track(
+    track_id: int,
+    now: Optional[float] = None,
+    source_id: str = DEFAULT_SOURCE_ID,
+) -> TrackState:
+    """Get the state for a track of a source, creating it on first use."""
+    tracks = _get_source(source_id).tracks
+    state = tracks.get(track_id)
+    if state is None:
+        if len(tracks) >= MAX_TRACKED_VEHICLES:
+            # Full: evict the vehicle seen least recently
+            stale_id = min(tracks, key=lambda tid: tracks[tid].active_time)
+            del tracks[stale_id]
+        state = tracks[track_id] = TrackState(active_time=now or time.time())
+    return state
+
+
+def _drop_if_idle(track_id: int, source_id: str = DEFAULT_SOURCE_ID):
+    """Forget a track once it holds no parking, plate or penalty state."""
+    tracks = _get_source(source_id).tracks
+    state = tracks.get(track_id)
+    if state is not None and state.is_idle:
+        del tracks[track_id]
+
+
+@dataclass(slots=True)
 class Detection:
     """Container for a single detection result."""
     track_id: int
@@ -145,6 +316,7 @@ class Detection:
     parking_status: str = ""  # "", "warning", "violation"
     parking_zone: Optional[str] = None
     is_penalized: bool = False
+    zone_index: int = -1  # index into parking_zones containing the centroid
     
     def to_dict(self) -> dict:
         return {
@@ -166,7 +338,7 @@ class Detection:
         }
 
 
-@dataclass 
+@dataclass(slots=True)
 class FrameResult:
     """Container for detection results from a single frame."""
     frame_id: int
@@ -191,6 +363,38 @@ class FrameResult:
             "parking_violations": self.parking_violations,
             "detections": [d.to_dict() for d in self.detections],
         }
+    
+    def to_json(self) -> bytes:
+        """Serialize for SSE/WebSocket clients (orjson when installed)."""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict()).encode()
+
+
+@dataclass(slots=True)
+class SourceState:
+    """
+    All state kept for one video source.
+    
+    Ultralytics numbers track IDs per tracker (one per batch slot), so the
+    same track_id on two sources is two different vehicles.
+    """
+    prev_detections: List[Detection] = field(default_factory=list)
+    detection_interval: int = YOLO_MAX_DETECTION_INTERVAL
+    frames_since_detection: int = YOLO_MAX_DETECTION_INTERVAL  # run on first frame
+    # Plate stage: frames processed and the last plate boxes found
+    frame_count: int = 0
+    prev_plate_boxes: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    # Per-vehicle state (parking timer, plate/OCR cache, penalty): track_id -> TrackState
+    tracks: Dict[int, TrackState] = field(default_factory=dict)
+
+
+def _get_source(source_id: str) -> SourceState:
+    """Get the state for a source, creating it on first use."""
+    state = _sources.get(source_id)
+    if state is None:
+        state = _sources[source_id] = SourceState()
+    return state
 
 
 # ============================================================================
@@ -218,6 +422,7 @@ VEHICLE_CLASS_IDS = [2, 3, 5, 7]
 # ============================================================================
 
 _ocr_service = None
+_ocr_batch_service = None
 _scoring_engine = None
 _traffic_controller = None
 _tts_service = None
@@ -237,6 +442,20 @@ def get_ocr_service():
     return _ocr_service
 
 
+def get_ocr_batch_service():
+    """Lazy load batched OCR (one EasyOCR call for many plate crops)."""
+    global _ocr_batch_service
+    if _ocr_batch_service is None:
+        try:
+            from app.services.ocr import read_plates_batched
+            _ocr_batch_service = read_plates_batched
+        except ImportError as e:
+            print(f"⚠️ Batched OCR not available: {e}")
+            read_plate = get_ocr_service()
+            _ocr_batch_service = lambda crops: [read_plate(c) for c in crops]
+    return _ocr_batch_service
+
+
 def get_scoring_engine():
     """Lazy load scoring engine for database violations."""
     global _scoring_engine
@@ -268,35 +487,96 @@ def get_tts_service():
     return _tts_service
 
 
+# ============================================================================
+# BACKGROUND EVENT WORKER
+# ============================================================================
+# DB writes and audio playback take milliseconds to seconds. The detection
+# loop only enqueues events; a daemon thread performs the slow work.
+
+EVENT_QUEUE_MAXSIZE: int = 256
+
+_event_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+_event_worker: Optional[threading.Thread] = None
+_event_worker_lock = threading.Lock()
+_events_dropped: int = 0
+
+
+def _run_event_worker():
+    """Consume violation/TTS events until the process exits."""
+    while True:
+        event = _event_queue.get()
+        try:
+            if event["type"] == "violation":
+                _apply_parking_penalty(
+                    track_id=event["track_id"],
+                    plate_text=event["plate_text"],
+                    zone_id=event["zone_id"],
+                    source_id=event.get("source_id", DEFAULT_SOURCE_ID),
+                )
+            elif event["type"] == "tts":
+                _play_warning(event["warning_type"], event.get("plate"))
+        except Exception as e:
+            logger.error("[EVENTS] Error handling %s: %s", event.get("type"), e)
+        finally:
+            _event_queue.task_done()
+
+
+def _enqueue_event(event: Dict[str, Any]):
+    """Hand an event to the worker thread without blocking the caller."""
+    global _event_worker, _events_dropped
+    
+    if _event_worker is None:
+        with _event_worker_lock:
+            if _event_worker is None:
+                _event_worker = threading.Thread(
+                    target=_run_event_worker, name="detection-events", daemon=True
+                )
+                _event_worker.start()
+    
+    try:
+        _event_queue.put_nowait(event)
+    except queue.Full:
+        _events_dropped += 1
+        logger.warning("[EVENTS] ⚠️ Queue full, dropped %s event (%d total)", event["type"], _events_dropped)
+
+
 # ============================================================================
 # TTS WARNING FUNCTION
 # ============================================================================
 
-def speak_warning(message: str, track_id: int = None, warning_type: str = None):
+def speak_warning(
+    message: str,
+    track_id: int = None,
+    warning_type: str = None,
+    now: Optional[float] = None,
+    plate: Optional[str] = None,
+    source_id: str = DEFAULT_SOURCE_ID,
+):
     """
-    Play a voice warning using cached audio files (instant, non-blocking).
+    Queue a voice warning using cached audio files (non-blocking).
     
     Args:
         message: The warning message (used for logging)
         track_id: Vehicle track ID (for cooldown tracking)
         warning_type: Type of warning - 'parking_warning', 'parking_violation', 
                      'speeding_warning'. If None, tries to detect from message.
+        now: Frame timestamp (defaults to the current time)
+        plate: Plate to read out, built from cached speech fragments
+        source_id: Video source the track_id belongs to
     
     Includes cooldown to prevent spam.
     """
-    global parking_tracker
-    
-    current_time = time.time()
+    current_time = now or time.time()
     
     # Check TTS cooldown for this vehicle
-    if track_id is not None and track_id in parking_tracker:
-        last_tts = parking_tracker[track_id].get("tts_time", 0)
-        if (current_time - last_tts) < TTS_COOLDOWN_SECONDS:
+    state = _get_source(source_id).tracks.get(track_id) if track_id is not None else None
+    if state is not None and state.entry_time is not None:
+        if (current_time - state.tts_time) < TTS_COOLDOWN_SECONDS:
             return  # Skip, too soon
-        parking_tracker[track_id]["tts_time"] = current_time
+        state.tts_time = current_time
     
     # Log to console
-    print(f"[AUDIO] 🔊 {message}")
+    logger.info("[AUDIO] 🔊 %s", message)
     
     # Detect warning type from message if not provided
     if warning_type is None:
@@ -310,39 +590,78 @@ def speak_warning(message: str, track_id: int = None, warning_type: str = None):
         else:
             warning_type = "parking_warning"  # Default
     
-    # Try to use TTS service - play cached audio (instant, non-blocking)
+    _enqueue_event({"type": "tts", "warning_type": warning_type, "plate": plate})
+
+
+def _play_warning(warning_type: str, plate: Optional[str] = None):
+    """Play a cached warning clip. Runs on the event worker thread."""
     tts = get_tts_service()
     if tts:
         try:
-            # Try cached playback first (instant, no generation)
-            played = tts.play_cached_warning(warning_type)
-            if not played:
-                # Fallback: play any available warning file
-                played = tts.play_any_warning()
+            # Known plate: "Vehicle <plate> ..." joined from cached fragments
+            played = bool(plate) and tts.speak_templated("vehicle", plate, warning_type)
+            # Otherwise cached playback (instant, no generation), started on
+            # the TTS I/O pool so the player spawn does not hold up penalties
             if not played:
-                print(f"[TTS] No audio files available")
+                future = tts.play_cached_warning_nowait(warning_type)
+                future.add_done_callback(lambda f: _play_fallback_warning(tts, f))
         except Exception as e:
-            print(f"[TTS] Error: {e}")
+            logger.error("[TTS] Error: %s", e)
+
+
+def _play_fallback_warning(tts, future):
+    """Play any available warning file if the cached clip could not be played."""
+    try:
+        played = future.result()
+    except Exception as e:
+        logger.error("[TTS] Error: %s", e)
+        played = False
+    if not played and not tts.play_any_warning():
+        logger.warning("[TTS] No audio files available")
 
 
 # ============================================================================
 # MODEL LOADING
 # ============================================================================
 
-def load_model(model_path: str, device: str = "cpu") -> Any:
-    """Load a YOLOv8 model with caching."""
+def load_model(
+    model_path: str,
+    device: str = "cpu",
+    precision: Optional[str] = None,
+    imgsz: int = MODEL_WARMUP_SIZE,
+    batch: int = ENGINE_VEHICLE_BATCH,
+) -> Any:
+    """
+    Load a YOLOv8 model with caching.
+    
+    With a CUDA device and fp16/int8 precision the model is exported once to
+    a TensorRT engine next to the weights and the engine is loaded instead.
+    The engine gets dynamic shapes up to `batch` images at `imgsz`, so the
+    batched callers work without running scripts/export_engines.py first.
+    """
     global _model_cache
     
-    cache_key = f"{model_path}_{device}"
+    precision = (precision or settings.model_precision).lower()
+    cache_key = f"{model_path}_{device}_{precision}"
     
     if cache_key not in _model_cache:
         from ultralytics import YOLO
         
-        print(f"🔄 Loading model: {model_path} on {device}...")
+        print(f"🔄 Loading model: {model_path} on {device} ({precision})...")
         start = time.time()
         
-        model = YOLO(model_path)
-        model.to(device)
+        model = None
+        if precision in ("fp16", "int8") and cuda_available(device):
+            engine_path = export_tensorrt_engine(
+                model_path, device, precision, imgsz=imgsz, batch=batch, dynamic=True
+            )
+            if engine_path:
+                model = YOLO(engine_path, task="detect")
+        
+        if model is None:
+            model = YOLO(model_path)
+            model.to(device)
+        warmup_model(model, size=imgsz)
         
         print(f"✅ Model loaded in {time.time() - start:.2f}s")
         _model_cache[cache_key] = model
@@ -350,6 +669,79 @@ def load_model(model_path: str, device: str = "cpu") -> Any:
     return _model_cache[cache_key]
 
 
+def cuda_available(device: str) -> bool:
+    """Check that a CUDA device was requested and is usable."""
+    if str(device).startswith(("cpu", "mps")):
+        return False
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def export_tensorrt_engine(
+    model_path: str,
+    device: str,
+    precision: str,
+    imgsz: int = MODEL_WARMUP_SIZE,
+    batch: int = 1,
+    dynamic: bool = False,
+    force: bool = False,
+) -> Optional[str]:
+    """
+    Export a model to a TensorRT engine (cached on disk as <stem>.<precision>.engine).
+    
+    load_model picks the engine up automatically for the same precision.
+    Use dynamic=True with batch > 1 for engines that serve batched calls
+    (track_vehicles_batch, batched plate crops).
+    
+    Returns the engine path, or None if export is not possible here.
+    """
+    engine_path = Path(model_path).with_suffix(f".{precision}.engine")
+    weights_path = Path(model_path)
+    if not force and engine_path.exists() and (
+        not weights_path.exists() or engine_path.stat().st_mtime >= weights_path.stat().st_mtime
+    ):
+        return str(engine_path)
+    
+    try:
+        from ultralytics import YOLO
+        
+        print(f"🔧 Exporting {model_path} to TensorRT ({precision})...")
+        export_args = {
+            "format": "engine",
+            "half": precision == "fp16",
+            "int8": precision == "int8",
+            "imgsz": imgsz,
+            "dynamic": dynamic,
+            "batch": batch,
+            "device": device,
+        }
+        if precision == "int8" and settings.int8_calibration_data:
+            export_args["data"] = settings.int8_calibration_data
+        
+        exported = YOLO(model_path).export(**export_args)
+        Path(exported).replace(engine_path)
+        return str(engine_path)
+    except Exception as e:
+        print(f"⚠️ TensorRT export failed, using PyTorch weights: {e}")
+        return None
+
+
+def warmup_model(model: Any, runs: int = MODEL_WARMUP_RUNS, size: int = MODEL_WARMUP_SIZE):
+    """
+    Run dummy inferences so one-time setup (predictor creation, fused layers,
+    backend autotuning) happens at load time instead of on the first frame.
+    """
+    dummy = np.zeros((size, size, 3), dtype=np.uint8)
+    try:
+        for _ in range(runs):
+            model.predict(source=dummy, verbose=False)
+    except Exception as e:
+        print(f"⚠️ Model warmup skipped: {e}")
+
+
 def load_vehicle_model(device: str = "cpu") -> Any:
     """Load the YOLOv8 vehicle detection model."""
     model_path = settings.models_dir / settings.vehicle_model
@@ -360,13 +752,19 @@ def load_vehicle_model(device: str = "cpu") -> Any:
 
 
 def load_plate_model(device: str = "cpu") -> Any:
-    """Load the custom license plate detection model."""
+    """
+    Load the custom license plate detection model.
+    
+    Plate crops are small and OCR re-checks every read, so the plate model can
+    run at lower precision (PLATE_MODEL_PRECISION=int8) than the vehicle model.
+    """
+    precision = settings.plate_model_precision or None
     # Prioritize config path
     path = settings.models_dir / settings.plate_model
     
     if path and path.exists():
         print(f"📋 Found plate model at: {path}")
-        return load_model(str(path), device)
+        return load_model(str(path), device, precision, imgsz=PLATE_CROP_SIZE, batch=ENGINE_PLATE_BATCH)
     
     # Fallback checks (legacy)
     possible_paths = [
@@ -377,7 +775,7 @@ def load_plate_model(device: str = "cpu") -> Any:
     for p in possible_paths:
         if p.exists():
              print(f"📋 Found plate model at: {p}")
-             return load_model(str(p), device)
+             return load_model(str(p), device, precision, imgsz=PLATE_CROP_SIZE, batch=ENGINE_PLATE_BATCH)
     
     print(f"⚠️ Plate model not found at {path}")
     return None
@@ -394,16 +792,120 @@ def get_models(device: str = "cpu") -> Tuple[Any, Any]:
 
 def point_in_polygon(point: Tuple[int, int], polygon: List[Tuple[int, int]]) -> bool:
     """Check if a point is inside a polygon using cv2.pointPolygonTest."""
-    polygon_np = np.array(polygon, dtype=np.int32)
+    polygon_np = np.asarray(polygon, dtype=np.int32)  # no copy for cached arrays
     result = cv2.pointPolygonTest(polygon_np, point, False)
     return result >= 0
 
 
 def get_zone_for_point(point: Tuple[int, int]) -> Optional[Dict]:
     """Find which parking zone contains a point, if any."""
-    for zone in parking_zones:
-        if point_in_polygon(point, zone["polygon"]):
-            return zone
+    zone_idx = int(batch_zone_lookup(np.array([point], dtype=np.float64))[0])
+    return parking_zones[zone_idx] if zone_idx >= 0 else None
+
+
+def points_in_polygons(
+    points: np.ndarray,
+    poly_pts: np.ndarray,
+    poly_off: np.ndarray,
+) -> np.ndarray:
+    """
+    Test M points against K polygons in one vectorized even-odd ray cast.
+    
+    Points on an edge or vertex count as inside, matching
+    cv2.pointPolygonTest(...) >= 0 and the cv2.fillPoly zone mask.
+    
+    Args:
+        points: (M, 2) array of (x, y) points
+        poly_pts: (V, 2) vertices of all polygons, concatenated
+        poly_off: (K + 1,) offsets of each polygon's first vertex in poly_pts
+        
+    Returns:
+        (M, K) bool mask, True where point m lies inside polygon k
+    """
+    num_points = len(points)
+    num_polys = len(poly_off) - 1
+    if num_points == 0 or num_polys <= 0:
+        return np.zeros((num_points, max(num_polys, 0)), dtype=bool)
+    
+    # Edge i runs from vertex i to the next vertex of the same polygon
+    next_idx = np.arange(1, len(poly_pts) + 1)
+    next_idx[poly_off[1:] - 1] = poly_off[:-1]
+    
+    verts = poly_pts.astype(np.float64)
+    x1, y1 = verts[:, 0], verts[:, 1]
+    x2, y2 = verts[next_idx, 0], verts[next_idx, 1]
+    
+    px = points[:, 0:1].astype(np.float64)  # (M, 1)
+    py = points[:, 1:2].astype(np.float64)
+    
+    # Edges straddling the horizontal ray, and where the ray crosses them
+    straddles = (y1 > py) != (y2 > py)  # (M, V)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+    hits = (straddles & (px < x_cross)).astype(np.int32)
+    
+    # The ray cast alone puts right/bottom edges outside: test edges exactly
+    on_edge = (
+        ((x2 - x1) * (py - y1) == (y2 - y1) * (px - x1))
+        & (px >= np.minimum(x1, x2)) & (px <= np.maximum(x1, x2))
+        & (py >= np.minimum(y1, y2)) & (py <= np.maximum(y1, y2))
+    )
+    
+    # Crossings per polygon; odd count = inside
+    crossings = np.add.reduceat(hits, poly_off[:-1], axis=1)
+    return (crossings & 1).astype(bool) | np.logical_or.reduceat(on_edge, poly_off[:-1], axis=1)
+
+
+def batch_zone_lookup(centroids: np.ndarray) -> np.ndarray:
+    """
+    Find the first parking zone containing each centroid.
+    
+    Args:
+        centroids: (N, 2) array of (x, y) points
+        
+    Returns:
+        (N,) int array of indices into parking_zones, -1 where none matches
+    """
+    inside = points_in_polygons(centroids, _zone_pts, _zone_off)
+    if inside.shape[1] == 0:
+        return np.full(len(centroids), -1, dtype=np.int64)
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+
+
+def get_zone_mask(h: int, w: int) -> np.ndarray:
+    """
+    Rasterize the parking zones for an h x w frame (cached until zones change).
+    
+    Each pixel holds the index + 1 of the first zone covering it, 0 for none.
+    """
+    mask = _zone_mask_cache.get((h, w))
+    if mask is None:
+        mask = np.zeros((h, w), dtype=np.int16)
+        # Paint in reverse so the first listed zone wins where zones overlap
+        for zone_idx in range(len(parking_zones) - 1, -1, -1):
+            cv2.fillPoly(mask, [parking_zones[zone_idx]["polygon_np"]], zone_idx + 1)
+        _zone_mask_cache[(h, w)] = mask
+    return mask
+
+
+def mask_zone_lookup(cx: np.ndarray, cy: np.ndarray, h: int, w: int) -> np.ndarray:
+    """
+    Find the parking zone of each centroid with one gather from the zone mask.
+    
+    Returns:
+        (N,) int array of indices into parking_zones, -1 where none matches
+    """
+    mask = get_zone_mask(h, w)
+    inside = (cx >= 0) & (cx < w) & (cy >= 0) & (cy < h)
+    zone_idxs = np.full(len(cx), -1, dtype=np.int64)
+    zone_idxs[inside] = mask[cy[inside], cx[inside]].astype(np.int64) - 1
+    return zone_idxs
+
+
+def get_zone_for_detection(det: "Detection") -> Optional[Dict]:
+    """Get the parking zone resolved for a detection by track_vehicles."""
+    if 0 <= det.zone_index < len(parking_zones):
+        return parking_zones[det.zone_index]
     return None
 
 
@@ -421,6 +923,7 @@ def get_zone_for_point(point: Tuple[int, int]) -> Optional[Dict]:
 def check_parking_violation(
     det: Detection,
     current_time: float,
+    source_id: str = DEFAULT_SOURCE_ID,
 ) -> Tuple[float, str, Optional[str], bool]:
     """
     Check if a vehicle is in a parking violation zone.
@@ -428,29 +931,30 @@ def check_parking_violation(
     Returns:
         Tuple of (time_in_zone, status, zone_id, is_penalized)
     """
-    global parking_tracker, penalized_vehicles
-    
     track_id = det.track_id
+    state = _get_source(source_id).tracks.get(track_id)
+    tracking = state is not None and state.entry_time is not None
     
     # Check if vehicle centroid is in any parking zone
-    zone = get_zone_for_point(det.centroid)
+    zone = get_zone_for_detection(det)
     
     # GHOST LOGIC: If lost but in grace period, treat as present
-    if zone is None and track_id in parking_tracker:
-        entry = parking_tracker[track_id]
-        time_since_seen = current_time - entry.get("last_seen", current_time)
+    if zone is None and tracking:
+        time_since_seen = current_time - state.last_seen
         
         if time_since_seen <= 5.0:  # Within grace period
             # Restore ghost zone
-            zone = {"id": entry["zone_id"]}
+            zone = {"id": state.zone_id}
             # Do NOT update last_seen (it's lost)
         else:
-            print(f"[DEBUG] Vehicle {track_id} lost for >5s -> Timer Reset")
-            del parking_tracker[track_id]
-            return 0.0, "", None, track_id in penalized_vehicles
+            logger.debug("[DEBUG] Vehicle %d lost for >5s -> Timer Reset", track_id)
+            state.clear_parking()
+            is_penalized = state.penalized_time is not None
+            _drop_if_idle(track_id, source_id)
+            return 0.0, "", None, is_penalized
             
     if zone is None:
-        return 0.0, "", None, track_id in penalized_vehicles
+        return 0.0, "", None, state is not None and state.penalized_time is not None
     
     zone_id = zone["id"]
     
@@ -458,83 +962,96 @@ def check_parking_violation(
     # We rely on the duration in zone to determine parking.
     is_stationary = True
     
-    if track_id in parking_tracker:
-        entry = parking_tracker[track_id]
-        time_in_zone = current_time - entry["entry_time"]
+    if tracking:
+        time_in_zone = current_time - state.entry_time
         
         if time_in_zone >= PARKING_VIOLATION_SECONDS:
             status = "violation"
             
-            if not entry.get("penalized", False):
-                # APPLY PENALTY TO DATABASE
-                _apply_parking_penalty(
-                    track_id=track_id,
-                    plate_text=det.plate_text or entry.get("plate"),
-                    zone_id=zone_id,
-                )
-                entry["penalized"] = True
-                penalized_vehicles[track_id] = current_time
+            if not state.penalized:
+                # APPLY PENALTY TO DATABASE (on the event worker)
+                _enqueue_event({
+                    "type": "violation",
+                    "track_id": track_id,
+                    "plate_text": det.plate_text or state.plate,
+                    "zone_id": zone_id,
+                    "source_id": source_id,
+                })
+                state.penalized = True
+                state.penalized_time = current_time
                 
                 # TTS Violation announcement
                 plate_display = det.plate_text or f"Vehicle {track_id}"
                 speak_warning(
                     f"Violation recorded for {plate_display}. Fine has been issued.",
-                    track_id
+                    track_id,
+                    warning_type="parking_violation",
+                    now=current_time,
+                    plate=det.plate_text,
+                    source_id=source_id,
                 )
                 
         elif time_in_zone >= PARKING_WARNING_SECONDS:
             status = "warning"
             
-            if not entry.get("warned", False):
+            if not state.warned:
                 # TTS Warning
                 plate_display = det.plate_text or f"Vehicle {track_id}"
                 speak_warning(
                     f"{plate_display}, please move immediately. You are in a no parking zone.",
-                    track_id
+                    track_id,
+                    warning_type="parking_warning",
+                    now=current_time,
+                    plate=det.plate_text,
+                    source_id=source_id,
                 )
-                entry["warned"] = True
+                state.warned = True
         else:
             status = ""
         
         # Update plate if available
-        if det.plate_text and not entry.get("plate"):
-            entry["plate"] = det.plate_text
+        if det.plate_text and not state.plate:
+            state.plate = det.plate_text
         
         # Only update last_seen if we actually see it (zone is not None originally)
         # We know zone is not None here because of the Ghost logic above
         # But we need to distinguish Ghost vs Real
-        real_zone = get_zone_for_point(det.centroid)
+        real_zone = get_zone_for_detection(det)
         if real_zone:
-            entry["last_seen"] = current_time
+            state.last_seen = current_time
         
-        is_penalized = entry.get("penalized", False) or track_id in penalized_vehicles
+        is_penalized = state.penalized or state.penalized_time is not None
         return time_in_zone, status, zone_id, is_penalized
     
     else:
         # Start tracking if vehicle is stationary in zone
         # Only start if REAL zone
+        state = _get_track(track_id, current_time, source_id)
         if zone and is_stationary:
-            print(f"[DEBUG] Vehicle {track_id} stationary in {zone_id} at {current_time:.1f}")
-            parking_tracker[track_id] = {
-                "entry_time": current_time,
-                "zone_id": zone_id,
-                "warned": False,
-                "penalized": False,
-                "plate": det.plate_text,
-                "tts_time": 0,
-                "last_seen": current_time,
-            }
-        return 0.0, "", zone_id, track_id in penalized_vehicles
-
-
-def _apply_parking_penalty(track_id: int, plate_text: str, zone_id: str):
+            logger.debug("[DEBUG] Vehicle %d stationary in %s at %.1f", track_id, zone_id, current_time)
+            state.start_parking(zone_id, current_time, det.plate_text)
+        return 0.0, "", zone_id, state.penalized_time is not None
+
+
+def _apply_parking_penalty(
+    track_id: int,
+    plate_text: str,
+    zone_id: str,
+    source_id: str = DEFAULT_SOURCE_ID,
+):
     """Apply parking violation penalty to database via ScoringEngine."""
     scoring = get_scoring_engine()
     
-    driver_id = plate_text or f"UNKNOWN-{track_id}"
+    # Without a plate the track ID is all we have; it is only unique per source
+    if plate_text:
+        driver_id = plate_text
+    elif source_id == DEFAULT_SOURCE_ID:
+        driver_id = f"UNKNOWN-{track_id}"
+    else:
+        driver_id = f"UNKNOWN-{source_id}-{track_id}"
     
     if scoring["engine"] is None:
-        print(f"[PENALTY] ⚠️ Scoring engine not available. Would penalize: {driver_id}")
+        logger.warning("[PENALTY] ⚠️ Scoring engine not available. Would penalize: %s", driver_id)
         return
     
     ViolationType = scoring["ViolationType"]
@@ -547,34 +1064,69 @@ def _apply_parking_penalty(track_id: int, plate_text: str, zone_id: str):
             license_plate=plate_text,
             notes="Automated detection - illegal parking > 15 seconds",
         )
-        print(f"[PENALTY] 🚨 DB SAVED: {driver_id} | Score: {driver.current_score} | Fine: LKR {violation.fine_amount}")
+        logger.info(
+            "[PENALTY] 🚨 DB SAVED: %s | Score: %s | Fine: LKR %s",
+            driver_id, driver.current_score, violation.fine_amount,
+            extra={"track_id": track_id, "zone_id": zone_id, "plate": plate_text, "source_id": source_id},
+        )
         
     except Exception as e:
-        print(f"[PENALTY] Error saving to DB: {e}")
+        logger.error("[PENALTY] Error saving to DB: %s", e)
 
 
 
 
 
-def cleanup_parking_tracker(active_track_ids: set):
-    """Remove parking entries for vehicles no longer tracked (with grace period)."""
-    global parking_tracker
+def cleanup_parking_tracker(
+    active_track_ids: set,
+    now: Optional[float] = None,
+    source_id: str = DEFAULT_SOURCE_ID,
+):
+    """
+    Remove parking entries for vehicles no longer tracked (with grace period),
+    and forget penalized vehicles that have been gone for a long time.
     
-    current_time = time.time()
+    active_track_ids are the IDs the source's tracker currently reports.
+    """
+    current_time = now or time.time()
+    tracks = _get_source(source_id).tracks
     grace_period = 5.0  # Keep tracking for 5s even if detection is lost
     
     to_remove = []
+    expired = []
+    gone = []
     
-    for tid, entry in parking_tracker.items():
-        if tid not in active_track_ids:
+    for tid, state in tracks.items():
+        if tid in active_track_ids:
+            state.active_time = current_time
+            continue
+        
+        if state.plate_miss_bbox is not None:
+            gone.append(tid)
+        
+        if state.entry_time is not None:
             # Vehicle lost - check grace period
-            time_since_seen = current_time - entry.get("last_seen", current_time)
+            time_since_seen = current_time - state.last_seen
             if time_since_seen > grace_period:
                 to_remove.append(tid)
+        
+        if state.penalized_time is not None and (
+            current_time - state.active_time > PENALTY_RETENTION_SECONDS
+        ):
+            expired.append(tid)
     
     for tid in to_remove:
-        print(f"[DEBUG] Vehicle {tid} lost for >{grace_period}s -> Timer Reset")
-        del parking_tracker[tid]
+        logger.debug("[DEBUG] Vehicle %d lost for >%ss -> Timer Reset", tid, grace_period)
+        tracks[tid].clear_parking()
+    
+    for tid in expired:
+        tracks[tid].penalized_time = None
+    
+    for tid in gone:
+        tracks[tid].clear_plate_misses()
+    
+    for tid in set(to_remove).union(expired, gone):
+        _drop_if_idle(tid, source_id)
 
 
 # ============================================================================
@@ -592,95 +1144,285 @@ def track_vehicles(
     model: Any,
     frame: np.ndarray,
     confidence: float = 0.5,
-    frame_id: int = 0,
+    source_id: str = DEFAULT_SOURCE_ID,
+    now: Optional[float] = None,
 ) -> Tuple[List[Detection], bool]:
     """
-    Stage 1: Vehicle detection with tracking and frame skipping.
+    Stage 1: Vehicle detection with tracking and adaptive frame skipping.
+    """
+    return track_vehicles_batch(model, [frame], [source_id], confidence, now)[0]
+
+
+def track_vehicles_batch(
+    model: Any,
+    frames: List[np.ndarray],
+    source_ids: List[str],
+    confidence: float = 0.5,
+    now: Optional[float] = None,
+) -> List[Tuple[List[Detection], bool]]:
     """
-    global _prev_detections
+    Stage 1 for several video sources in one batched model.track() call.
     
-    run_detection = (frame_id % YOLO_DETECTION_INTERVAL == 0)
+    Ultralytics keeps one tracker per batch slot, so pass the same sources
+    in the same order on every call. The batch is skipped only when no
+    source is due for detection; otherwise every frame is re-detected.
     
-    if not run_detection and _prev_detections:
-        return _prev_detections, False
+    Args:
+        now: Frame timestamp shared by every detection in the batch
+            (defaults to the current time)
+    
+    Returns:
+        One (detections, ran_detection) tuple per source, in input order
+    """
+    states = [_get_source(source_id) for source_id in source_ids]
+    
+    for state in states:
+        state.frames_since_detection += 1
+    if all(st.frames_since_detection < st.detection_interval for st in states):
+        return [(st.prev_detections, False) for st in states]
     
     results = model.track(
-        source=frame,
+        source=frames if len(frames) > 1 else frames[0],
         conf=confidence,
         classes=VEHICLE_CLASS_IDS,
         persist=True,
         verbose=False,
     )
+    results = list(results or [])
+    results += [None] * (len(states) - len(results))
     
-    detections = []
-    current_time = time.time()
+    current_time = now or time.time()
     
-    if results and len(results) > 0:
-        result = results[0]
+    for source_id, state, result, frame in zip(source_ids, states, results, frames):
+        detections = _parse_vehicle_result(result, current_time, frame.shape[:2])
         
-        if result.boxes is not None:
-            boxes = result.boxes
-            
-            for i in range(len(boxes)):
-                xyxy = boxes.xyxy[i].cpu().numpy()
-                x1, y1, x2, y2 = map(int, xyxy)
-                
-                conf = float(boxes.conf[i].cpu().numpy())
-                cls_id = int(boxes.cls[i].cpu().numpy())
-                
-                track_id = int(boxes.id[i].cpu().numpy()) if boxes.id is not None else -1
-                
-                centroid = ((x1 + x2) // 2, (y1 + y2) // 2)
-                area = (x2 - x1) * (y2 - y1)
-                class_name = VEHICLE_CLASSES.get(cls_id, f"class_{cls_id}")
-                
-                detection = Detection(
-                    track_id=track_id,
-                    class_id=cls_id,
-                    class_name=class_name,
-                    confidence=conf,
-                    bbox=(x1, y1, x2, y2),
-                    centroid=centroid,
-                    area=area,
-                    timestamp=current_time,
-                )
-                
-                detections.append(detection)
+        state.prev_detections = detections
+        state.frames_since_detection = 0
+        
+        # Busy scene: detect more often. Empty scene: back off.
+        if detections:
+            state.detection_interval = max(YOLO_DETECTION_INTERVAL, state.detection_interval // 2)
+        else:
+            state.detection_interval = min(YOLO_MAX_DETECTION_INTERVAL, state.detection_interval * 2)
+        
+        cleanup_parking_tracker({d.track_id for d in detections}, current_time, source_id)
+    
+    return [(st.prev_detections, True) for st in states]
+
+
+def _parse_vehicle_result(
+    result: Any,
+    current_time: float,
+    frame_shape: Tuple[int, int],
+) -> List[Detection]:
+    """Convert one Ultralytics tracking result into Detection objects."""
+    detections = []
+    
+    if result is None or result.boxes is None or len(result.boxes) == 0:
+        return detections
+    
+    boxes = result.boxes
     
-    _prev_detections = detections
+    # One device->host copy per tensor instead of per box
+    xyxy = boxes.xyxy.cpu().numpy().astype(np.int32)
+    confs = boxes.conf.cpu().numpy()
+    cls_ids = boxes.cls.cpu().numpy().astype(np.int32)
+    if boxes.id is not None:
+        track_ids = boxes.id.cpu().numpy().astype(np.int32)
+    else:
+        track_ids = np.full(len(xyxy), -1, dtype=np.int32)
+    
+    cx = (xyxy[:, 0] + xyxy[:, 2]) // 2
+    cy = (xyxy[:, 1] + xyxy[:, 3]) // 2
+    areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+    
+    # Parking zone of every centroid in one gather from the zone raster
+    zone_idxs = mask_zone_lookup(cx, cy, *frame_shape)
     
-    active_ids = {d.track_id for d in detections}
-    cleanup_parking_tracker(active_ids)
+    # tolist() yields plain Python ints/floats (JSON-serializable)
+    for (x1, y1, x2, y2), conf, cls_id, track_id, x, y, area, zone_idx in zip(
+        xyxy.tolist(), confs.tolist(), cls_ids.tolist(), track_ids.tolist(),
+        cx.tolist(), cy.tolist(), areas.tolist(), zone_idxs.tolist(),
+    ):
+        class_name = VEHICLE_CLASSES.get(cls_id, f"class_{cls_id}")
+        
+        detections.append(Detection(
+            track_id=track_id,
+            class_id=cls_id,
+            class_name=class_name,
+            confidence=conf,
+            bbox=(x1, y1, x2, y2),
+            centroid=(x, y),
+            area=area,
+            timestamp=current_time,
+            zone_index=zone_idx,
+        ))
     
-    return detections, True
+    return detections
 
 
 # ============================================================================
 # STAGE 2: PLATE DETECTION WITH OCR
 # ============================================================================
 
+def bbox_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _plate_hash(crop: np.ndarray) -> bytes:
+    """Difference hash of a plate crop: sign of horizontal gradients on a tiny grayscale."""
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    small = cv2.resize(gray, (OCR_HASH_SIZE + 1, OCR_HASH_SIZE), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1]).tobytes()
+
+
+def _ocr_cached(crop: np.ndarray) -> Optional[str]:
+    """
+    Read a plate, reusing the result for visually identical crops.
+    
+    A parked vehicle yields near-identical crops frame after frame; hashing
+    takes well under a millisecond versus tens to hundreds for OCR.
+    """
+    key = _plate_hash(crop)
+    if key in _ocr_hash_cache:
+        _ocr_hash_cache.move_to_end(key)
+        return _ocr_hash_cache[key]
+    
+    text = get_ocr_service()(crop)
+    _ocr_hash_cache[key] = text
+    if len(_ocr_hash_cache) > OCR_CACHE_SIZE:
+        _ocr_hash_cache.popitem(last=False)
+    return text
+
+
+def _ocr_cached_batch(crops: List[np.ndarray]) -> List[Optional[str]]:
+    """Like _ocr_cached, but all cache misses are read in one batched OCR call."""
+    keys = [_plate_hash(crop) for crop in crops]
+    texts: List[Optional[str]] = [None] * len(crops)
+    misses = []
+    
+    for i, key in enumerate(keys):
+        if key in _ocr_hash_cache:
+            _ocr_hash_cache.move_to_end(key)
+            texts[i] = _ocr_hash_cache[key]
+        else:
+            misses.append(i)
+    
+    if misses:
+        read_batch = get_ocr_batch_service()
+        for i, text in zip(misses, read_batch([crops[i] for i in misses])):
+            texts[i] = text
+            _ocr_hash_cache[keys[i]] = text
+        while len(_ocr_hash_cache) > OCR_CACHE_SIZE:
+            _ocr_hash_cache.popitem(last=False)
+    
+    return texts
+
+
+def _plate_input_tensor(plate_model: Any, images: List[np.ndarray]) -> Optional[Tuple[Any, List[float]]]:
+    """
+    Upload a plate batch through persistent pinned/device buffers (CUDA only).
+    
+    Ultralytics skips its letterbox for tensor input, so it is done here:
+    every image is resized so its longer side is PLATE_CROP_SIZE (small
+    crops upscaled, as the numpy path would) and written to the top-left of
+    its square slot in a page-locked host buffer, then copied to the GPU
+    asynchronously and handed to predict as a normalized BCHW tensor.
+    
+    Returns:
+        (tensor, scales) where boxes for image i must be divided by
+        scales[i], or None (use the numpy list) on CPU or for oversized batches
+    """
+    global _plate_upload_buffers
+    
+    device = str(getattr(plate_model, "device", "cpu"))
+    if not device.startswith("cuda") or len(images) > PLATE_UPLOAD_MAX_BATCH:
+        return None
+    try:
+        import torch
+    except ImportError:
+        return None
+    
+    if _plate_upload_buffers is None:
+        shape = (PLATE_UPLOAD_MAX_BATCH, PLATE_CROP_SIZE, PLATE_CROP_SIZE, 3)
+        host = torch.empty(shape, dtype=torch.uint8, pin_memory=True)
+        _plate_upload_buffers = (host, torch.empty(shape, dtype=torch.uint8, device=device))
+    host, dev = _plate_upload_buffers
+    
+    n = len(images)
+    host_np = host.numpy()
+    host_np[:n].fill(114)  # Ultralytics letterbox grey
+    scales = []
+    for i, image in enumerate(images):
+        h, w = image.shape[:2]
+        scale = PLATE_CROP_SIZE / max(h, w)
+        if scale != 1.0:
+            w = min(PLATE_CROP_SIZE, max(1, round(w * scale)))
+            h = min(PLATE_CROP_SIZE, max(1, round(h * scale)))
+            image = cv2.resize(image, (w, h), interpolation=cv2.INTER_LINEAR)
+        host_np[i, :h, :w] = image
+        scales.append(scale)
+    dev[:n].copy_(host[:n], non_blocking=True)
+    # NHWC BGR uint8 -> NCHW RGB float in [0, 1]
+    return dev[:n].permute(0, 3, 1, 2).flip(1).float().div_(255.0), scales
+
+
 def detect_plates_in_crops(
     plate_model: Any,
     frame: np.ndarray,
     vehicle_detections: List[Detection],
     confidence: float = 0.2,
+    now: Optional[float] = None,
+    source_id: str = DEFAULT_SOURCE_ID,
 ) -> Tuple[List[Tuple[int, int, int, int]], Dict[int, Dict[str, Any]]]:
     """Stage 2: Plate detection with OCR caching."""
-    global plate_history, ocr_cooldown
-    
     if plate_model is None:
         return [], {}
     
     all_plates = []
     vehicle_plate_map = {}
+    to_ocr = []  # (track_id, state, plate_crop) read together after the loop
     
-    read_plate = get_ocr_service()
-    current_time = time.time()
+    current_time = now or time.time()
+    tracks = _get_source(source_id).tracks
+    h, w = frame.shape[:2]
     
+    # Collect every usable vehicle crop first, then run the plate model once
+    # on the whole list so preprocessing and the forward pass are batched
+    crops = []
     for det in vehicle_detections:
+        # Motion gate: a vehicle that hasn't moved keeps its known plate
+        state = tracks.get(det.track_id)
+        if (
+            state is not None and state.plate_text and state.plate_vehicle_bbox is not None
+            and bbox_iou(det.bbox, state.plate_vehicle_bbox) > PLATE_REUSE_IOU
+        ):
+            dx = det.bbox[0] - state.plate_vehicle_bbox[0]
+            dy = det.bbox[1] - state.plate_vehicle_bbox[1]
+            px1, py1, px2, py2 = state.plate_bbox
+            plate_bbox = (px1 + dx, py1 + dy, px2 + dx, py2 + dy)
+            all_plates.append(plate_bbox)
+            vehicle_plate_map[det.track_id] = {"bbox": plate_bbox, "text": state.plate_text}
+            state.plate_age = 0
+            continue
+        
+        # Negative cache: a parked vehicle with no visible plate is not
+        # re-checked every detection frame until it moves
+        if (
+            state is not None and state.plate_misses >= PLATE_MISS_LIMIT
+            and bbox_iou(det.bbox, state.plate_miss_bbox) > PLATE_MISS_IOU
+        ):
+            continue
+        
         vx1, vy1, vx2, vy2 = det.bbox
         
-        h, w = frame.shape[:2]
         vx1, vy1 = max(0, vx1), max(0, vy1)
         vx2, vy2 = min(w, vx2), min(h, vy2)
         
@@ -689,82 +1431,127 @@ def detect_plates_in_crops(
             continue
         
         vehicle_crop = frame[vy1:vy2, vx1:vx2]
+        # Downscale only; letterbox upscales smaller crops to imgsz itself
+        # (and maps their boxes back), so scale stays 1.0 for those. The
+        # CUDA tensor path does the same upscale in _plate_input_tensor.
+        scale = min(1.0, PLATE_CROP_SIZE / max(crop_w, crop_h))
+        if scale < 1.0:
+            model_input = cv2.resize(
+                vehicle_crop,
+                (max(1, int(crop_w * scale)), max(1, int(crop_h * scale))),
+                interpolation=cv2.INTER_LINEAR,
+            )
+        else:
+            model_input = vehicle_crop
+        crops.append((det, vx1, vy1, crop_h, vehicle_crop, model_input, scale))
+    
+    if not crops:
+        return all_plates, vehicle_plate_map
+    
+    images = [c[5] for c in crops]
+    upload = _plate_input_tensor(plate_model, images)
+    if upload is not None:
+        source, input_scales = upload
+    else:
+        # Letterbox maps numpy-input boxes back to the image itself
+        source = images if len(images) > 1 else images[0]
+        input_scales = [1.0] * len(images)
+    
+    results = plate_model.predict(
+        source=source,
+        imgsz=PLATE_CROP_SIZE,
+        conf=confidence,
+        verbose=False,
+    )
+    
+    for (det, vx1, vy1, crop_h, vehicle_crop, _, scale), input_scale, result in zip(
+        crops, input_scales, results or []
+    ):
+        found = []
+        if result.boxes is not None and len(result.boxes) > 0:
+            # One device->host copy per crop instead of per box, mapped back
+            # from the model input to crop coordinates
+            xyxy = (result.boxes.xyxy.cpu().numpy() / (scale * input_scale)).astype(np.int32)
+            
+            # Geometric filter over all boxes at once: ignore plates centred
+            # in the top 30% of the vehicle. Keep the first survivor.
+            keep = ((xyxy[:, 1] + xyxy[:, 3]) // 2) >= crop_h * 0.3
+            found = xyxy[keep][:1].tolist()
         
-        results = plate_model.predict(source=vehicle_crop, conf=confidence, verbose=False)
+        if not found:
+            if det.track_id >= 0:
+                _get_track(det.track_id, current_time, source_id).record_plate_miss(det.bbox)
+            continue
         
-        if results and len(results) > 0 and results[0].boxes is not None:
-            boxes = results[0].boxes
-            
-            for i in range(len(boxes)):
-                xyxy = boxes.xyxy[i].cpu().numpy()
-                px1, py1, px2, py2 = map(int, xyxy)
-                
-                # Geometric filter: ignore top 30%
-                if (py1 + py2) // 2 < (crop_h * 0.3):
-                    continue
-                
-                # Convert to real coordinates
-                real_px1, real_py1 = vx1 + px1, vy1 + py1
-                real_px2, real_py2 = vx1 + px2, vy1 + py2
-                plate_bbox = (real_px1, real_py1, real_px2, real_py2)
-                
-                # OCR with caching
-                plate_text = None
-                should_run_ocr = True
-                track_id = det.track_id
-                
-                if track_id in plate_history and plate_history[track_id].get("text"):
-                    plate_text = plate_history[track_id]["text"]
-                    last_ocr_time = ocr_cooldown.get(track_id, 0)
-                    if (current_time - last_ocr_time) < OCR_COOLDOWN_SECONDS:
-                        should_run_ocr = False
-                
-                if should_run_ocr:
-                    plate_crop = vehicle_crop[py1:py2, px1:px2]
-                    if plate_crop.size > 0:
-                        new_text = read_plate(plate_crop)
-                        if new_text:
-                            plate_text = new_text
-                            # OCR success
-                            track_id = det.track_id
-                            if track_id:
-                                ocr_cooldown[track_id] = current_time
-                
-                all_plates.append(plate_bbox)
-                vehicle_plate_map[track_id] = {"bbox": plate_bbox, "text": plate_text}
-                
-                plate_history[track_id] = {
-                    "bbox": plate_bbox,
-                    "text": plate_text,
-                    "timestamp": current_time,
-                    "frame_count": 0,
-                }
-                break
+        px1, py1, px2, py2 = found[0]
+        # Convert to real coordinates
+        real_px1, real_py1 = vx1 + px1, vy1 + py1
+        real_px2, real_py2 = vx1 + px2, vy1 + py2
+        plate_bbox = (real_px1, real_py1, real_px2, real_py2)
+        
+        # OCR with caching
+        plate_text = None
+        should_run_ocr = True
+        track_id = det.track_id
+        
+        state = _get_track(track_id, current_time, source_id)
+        
+        if state.plate_text:
+            plate_text = state.plate_text
+            if (current_time - state.ocr_last) < OCR_COOLDOWN_SECONDS:
+                should_run_ocr = False
+        
+        if should_run_ocr:
+            plate_crop = vehicle_crop[py1:py2, px1:px2]
+            if plate_crop.size > 0:
+                to_ocr.append((track_id, state, plate_crop))
+        
+        all_plates.append(plate_bbox)
+        vehicle_plate_map[track_id] = {"bbox": plate_bbox, "text": plate_text}
+        
+        state.plate_bbox = plate_bbox
+        state.plate_text = plate_text
+        state.plate_age = 0
+        state.plate_vehicle_bbox = det.bbox
+        state.clear_plate_misses()
+    
+    # One batched OCR call for every plate due for (re)reading
+    if to_ocr:
+        texts = _ocr_cached_batch([crop for _, _, crop in to_ocr])
+        for (track_id, state, _), new_text in zip(to_ocr, texts):
+            if new_text:
+                # OCR success
+                logger.debug("[OCR] ID=%d Text=%s", track_id, new_text)
+                state.ocr_last = current_time
+                state.plate_text = new_text
+                vehicle_plate_map[track_id]["text"] = new_text
     
     return all_plates, vehicle_plate_map
 
 
-def update_plate_history(vehicle_detections: List[Detection]) -> Dict[int, Dict[str, Any]]:
+def update_plate_history(
+    vehicle_detections: List[Detection],
+    source_id: str = DEFAULT_SOURCE_ID,
+) -> Dict[int, Dict[str, Any]]:
     """Update plate history and return remembered plates."""
-    global plate_history
-    
+    tracks = _get_source(source_id).tracks
     current_track_ids = {det.track_id for det in vehicle_detections}
     remembered_plates = {}
     
     to_remove = []
-    for track_id, info in plate_history.items():
-        info["frame_count"] += 1
-        
-        if track_id in current_track_ids and info["frame_count"] < PLATE_HISTORY_MAX_AGE:
-            remembered_plates[track_id] = {"bbox": info["bbox"], "text": info.get("text")}
+    for track_id, state in tracks.items():
+        if state.plate_bbox is None:
+            continue
+        state.plate_age += 1
         
-        if info["frame_count"] >= PLATE_HISTORY_MAX_AGE:
+        if state.plate_age >= PLATE_HISTORY_MAX_AGE:
             to_remove.append(track_id)
+        elif track_id in current_track_ids:
+            remembered_plates[track_id] = {"bbox": state.plate_bbox, "text": state.plate_text}
     
     for track_id in to_remove:
-        del plate_history[track_id]
-        if track_id in ocr_cooldown:
-            del ocr_cooldown[track_id]
+        tracks[track_id].clear_plate()
+        _drop_if_idle(track_id, source_id)
     
     return remembered_plates
 
@@ -780,30 +1567,37 @@ def detect_and_track(
     confidence: float = 0.5,
     plate_model: Any = None,
     run_plate_detection: bool = True,
+    source_id: str = DEFAULT_SOURCE_ID,
 ) -> FrameResult:
     """
     Complete detection pipeline with all integrations.
+    
+    Call with a distinct source_id per camera: tracking, plate and parking
+    state are kept separately for each source.
     """
-    global _frame_counter, _prev_plate_boxes
+    source = _get_source(source_id)
     
+    # One timestamp for the whole frame, shared by every stage below
     timestamp = time.time()
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Stage 1: Vehicle tracking
-    detections, _ = track_vehicles(vehicle_model, frame, confidence, _frame_counter)
+    detections, _ = track_vehicles(vehicle_model, frame, confidence, source_id, now=timestamp)
     
     # Stage 2: Plate detection
     all_plates = []
     vehicle_plate_map = {}
     
     if run_plate_detection and plate_model is not None:
-        if _frame_counter % PLATE_DETECTION_INTERVAL == 0:
-            all_plates, vehicle_plate_map = detect_plates_in_crops(plate_model, frame, detections)
-            _prev_plate_boxes = all_plates
+        if source.frame_count % PLATE_DETECTION_INTERVAL == 0:
+            all_plates, vehicle_plate_map = detect_plates_in_crops(
+                plate_model, frame, detections, now=timestamp, source_id=source_id
+            )
+            source.prev_plate_boxes = all_plates
         else:
-            all_plates = _prev_plate_boxes
+            all_plates = source.prev_plate_boxes
         
-        remembered_plates = update_plate_history(detections)
+        remembered_plates = update_plate_history(detections, source_id)
         for track_id, plate_info in remembered_plates.items():
             if track_id not in vehicle_plate_map:
                 vehicle_plate_map[track_id] = plate_info
@@ -822,8 +1616,17 @@ def detect_and_track(
             det.plate_bbox = plate_info["bbox"]
             det.plate_text = plate_info.get("text")
         
+        # Fast path: outside every zone (zone_index was resolved for the whole
+        # batch in track_vehicles) and no parking/penalty history to update
+        if det.zone_index < 0 and det.track_id not in source.tracks:
+            det.parking_time = 0.0
+            det.parking_status = ""
+            det.parking_zone = None
+            det.is_penalized = False
+            continue
+        
         # Check parking violations
-        parking_time, parking_status, zone_id, is_penalized = check_parking_violation(det, timestamp)
+        parking_time, parking_status, zone_id, is_penalized = check_parking_violation(det, timestamp, source_id)
         det.parking_time = parking_time
         det.parking_status = parking_status
         det.parking_zone = zone_id
@@ -836,8 +1639,8 @@ def detect_and_track(
     
     vehicle_count = len(detections)
     
-    _frame_counter += 1
-    inference_time = (time.time() - start_time) * 1000
+    source.frame_count += 1
+    inference_time = (time.perf_counter() - start_time) * 1000
     
     return FrameResult(
         frame_id=frame_id,
@@ -856,17 +1659,63 @@ def detect_and_track(
 # VISUALIZATION
 # ============================================================================
 
+@lru_cache(maxsize=2048)
+def _text_size(label: str, font_scale: float, thickness: int) -> Tuple[int, int]:
+    """Cached cv2.getTextSize; box labels repeat across frames."""
+    return cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)[0]
+
+
+def _detection_labels(
+    detections: List[Detection],
+    show_labels: bool,
+    show_track_id: bool,
+) -> List[str]:
+    """
+    Build the box label of every detection, e.g. "ID:7 | car | ABC-123 | Parked: 42s [WARNING]".
+    
+    Each label segment is produced for the whole frame by one comprehension
+    and the segments are joined in bulk, instead of growing every label
+    string step by step inside the drawing loop.
+    """
+    if show_track_id and show_labels:
+        heads = [f"ID:{d.track_id} | {d.class_name}" if d.track_id >= 0 else d.class_name for d in detections]
+    elif show_track_id:
+        heads = [f"ID:{d.track_id}" if d.track_id >= 0 else "" for d in detections]
+    else:
+        heads = [d.class_name for d in detections]
+    plates = [f" | {d.plate_text}" if d.plate_text else " [Plate]" if d.has_plate else "" for d in detections]
+    parked = [
+        (f" | Parked: {d.parking_time:.0f}s [{d.parking_status.upper()}]" if d.parking_status
+         else f" | Parked: {d.parking_time:.0f}s") if d.parking_time > 0 else ""
+        for d in detections
+    ]
+    penalized = [" | PENALIZED!" if d.is_penalized else "" for d in detections]
+    return list(map("".join, zip(heads, plates, parked, penalized)))
+
+
 def draw_parking_zones(frame: np.ndarray) -> np.ndarray:
-    """Draw the parking zone boundaries on the frame."""
+    """Draw the parking zone boundaries onto the frame (in place)."""
+    if not parking_zones:
+        return frame
+    
+    # Draw filled polygons with transparency: fill every zone into one
+    # overlay and blend once, restricted to the rect covering all zones
+    rects = np.array([zone["rect"] for zone in parking_zones])
+    x1 = max(int(rects[:, 0].min()), 0)
+    y1 = max(int(rects[:, 1].min()), 0)
+    x2 = min(int((rects[:, 0] + rects[:, 2]).max()), frame.shape[1])
+    y2 = min(int((rects[:, 1] + rects[:, 3]).max()), frame.shape[0])
+    if x2 > x1 and y2 > y1:
+        roi = frame[y1:y2, x1:x2]
+        overlay = roi.copy()
+        for zone in parking_zones:
+            cv2.fillPoly(overlay, [zone["polygon_np"] - (x1, y1)], zone.get("color", (0, 0, 255)))
+        cv2.addWeighted(overlay, 0.2, roi, 0.8, 0, roi)
+    
     for zone in parking_zones:
-        polygon = np.array(zone["polygon"], dtype=np.int32)
+        polygon = zone["polygon_np"]
         color = zone.get("color", (0, 0, 255))
         
-        # Draw filled polygon with transparency
-        overlay = frame.copy()
-        cv2.fillPoly(overlay, [polygon], color)
-        cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
-        
         # Draw boundary
         cv2.polylines(frame, [polygon], True, color, 2)
         
@@ -885,13 +1734,15 @@ def draw_detections(
     show_track_id: bool = True,
     show_parking_zones: bool = True,
     box_thickness: int = 2,
+    in_place: bool = True,
 ) -> np.ndarray:
     """
     Draw detection boxes, plates, parking status.
     
-    Flashing purple for penalized vehicles.
+    Flashing purple for penalized vehicles. Draws onto `frame` itself unless
+    in_place=False (callers here don't reuse the raw frame afterwards).
     """
-    annotated = frame.copy()
+    annotated = frame if in_place else frame.copy()
     
     # Draw parking zones first
     if show_parking_zones:
@@ -908,13 +1759,21 @@ def draw_detections(
     }
     plate_color = (255, 255, 0)
     
-    # Draw plate boxes
-    for px1, py1, px2, py2 in result.plate_boxes:
-        cv2.rectangle(annotated, (px1, py1), (px2, py2), plate_color, box_thickness)
+    # Draw plate boxes (all outlines in one polylines call)
+    if result.plate_boxes:
+        plates = np.array(result.plate_boxes, dtype=np.int32)
+        quads = plates[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        cv2.polylines(annotated, list(quads), True, plate_color, box_thickness)
     
     current_time = time.time()
     
-    for det in result.detections:
+    labels = (
+        _detection_labels(result.detections, show_labels, show_track_id)
+        if show_labels or show_track_id else [None] * len(result.detections)
+    )
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    
+    for det, label in zip(result.detections, labels):
         x1, y1, x2, y2 = det.bbox
         
         # Choose color based on status
@@ -935,34 +1794,9 @@ def draw_detections(
         thickness = 3 if det.is_penalized else box_thickness
         cv2.rectangle(annotated, (x1, y1), (x2, y2), color, thickness)
         
-        # Build label
-        if show_labels or show_track_id:
-            label_parts = []
-            
-            if show_track_id and det.track_id >= 0:
-                label_parts.append(f"ID:{det.track_id}")
-            
-            if show_labels:
-                label_parts.append(det.class_name)
-            
-            label = " | ".join(label_parts)
-            
-            if det.plate_text:
-                label += f" | {det.plate_text}"
-            elif det.has_plate:
-                label += " [Plate]"
-            
-            # Parking timer
-            if det.parking_time > 0:
-                label += f" | Parked: {det.parking_time:.0f}s"
-                if det.parking_status:
-                    label += f" [{det.parking_status.upper()}]"
-            
-            if det.is_penalized:
-                label += " | PENALIZED!"
-            
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            (tw, th), _ = cv2.getTextSize(label, font, 0.5, 1)
+        # Draw label
+        if label is not None:
+            tw, th = _text_size(label, 0.5, 1)
             
             cv2.rectangle(annotated, (x1, y1 - th - 10), (x1 + tw + 4, y1), color, -1)
             cv2.putText(annotated, label, (x1 + 2, y1 - 5), font, 0.5, (255, 255, 255), 1)
@@ -998,6 +1832,240 @@ def draw_frame_info(frame: np.ndarray, result: FrameResult, extra_info: str = ""
 # VIDEO PROCESSING
 # ============================================================================
 
+def is_live_source(source: str) -> bool:
+    """True for camera indices and stream URLs (rtsp://, http://, ...)."""
+    source = str(source)
+    return source.isdigit() or "://" in source
+
+
+def open_capture(source: str, hw_decode: bool = True) -> cv2.VideoCapture:
+    """
+    Open a video source, preferring hardware-accelerated FFmpeg decoding.
+    
+    With hw_decode, files and stream URLs are opened through the FFmpeg
+    backend with CAP_PROP_HW_ACCELERATION=ANY, so OpenCV picks NVDEC/VAAPI/
+    D3D11 when its FFmpeg build supports one (decode then runs on the GPU's
+    video engine instead of a CPU core). A specific decoder can also be
+    forced via OPENCV_FFMPEG_CAPTURE_OPTIONS, e.g. "video_codec;h264_cuvid".
+    Falls back to the default backend (CPU decode) if that fails to open.
+    """
+    source = str(source)
+    if source.isdigit():
+        # Camera indices go through the platform backend (V4L2/DShow/...)
+        return cv2.VideoCapture(int(source))
+    if hw_decode:
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(source)
+
+
+class LatestFrameReader(threading.Thread):
+    """
+    Decode a live source on a background thread, keeping only the newest frame.
+    
+    If inference is slower than the camera, stale frames are overwritten
+    instead of queueing up inside the capture buffer, so latency stays at
+    roughly one frame no matter how far behind detection falls.
+    """
+    
+    def __init__(self, source: str, hw_decode: bool = True):
+        super().__init__(name="latest-frame-reader", daemon=True)
+        self.cap = open_capture(source, hw_decode)
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._seq = 0
+        self._taken_seq = 0
+        self._stopped = False
+    
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+    
+    def run(self):
+        try:
+            while not self._stopped:
+                if not self.cap.grab():
+                    break
+                ok, frame = self.cap.retrieve()
+                if not ok:
+                    continue
+                with self._cond:
+                    self._frame = frame
+                    self._seq += 1
+                    self._cond.notify_all()
+        finally:
+            self.cap.release()
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+    
+    def latest_frame(self, timeout: float = 5.0) -> Optional[np.ndarray]:
+        """
+        Wait for a frame newer than the last one returned and hand it out.
+        
+        Returns None once the stream has ended or nothing arrives in time.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > self._taken_seq or self._stopped, timeout)
+            if self._seq == self._taken_seq:
+                return None
+            self._taken_seq = self._seq
+            # The reader thread replaces, never mutates, frames: no copy needed
+            return self._frame
+    
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+        self.join(timeout=2.0)
+
+
+class PrefetchReader(threading.Thread):
+    """
+    Decode a video file on a background thread, a few frames ahead.
+    
+    Unlike LatestFrameReader nothing is dropped: frames go through a small
+    bounded queue, so decoding the next frame overlaps with inference on
+    the current one and per-frame cost becomes max(decode, inference).
+    """
+    
+    PREFETCH_FRAMES: int = 2
+    
+    def __init__(self, cap: cv2.VideoCapture):
+        super().__init__(name="prefetch-reader", daemon=True)
+        self.cap = cap
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=self.PREFETCH_FRAMES)
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                # Bounded put that still notices stop() while the queue is full
+                while not self._stop_event.is_set():
+                    try:
+                        self._queue.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            self.cap.release()
+            self._queue.put(None)  # End-of-stream marker
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Same contract as cv2.VideoCapture.read()."""
+        frame = self._queue.get()
+        if frame is None:
+            self._queue.put(None)  # Keep reporting end of stream
+            return False, None
+        return True, frame
+    
+    def stop(self):
+        self._stop_event.set()
+        # Unblock the producer if it is waiting on a full queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.join(timeout=2.0)
+
+
+class FrameRecorder(threading.Thread):
+    """
+    Encode annotated frames to a video file on a background thread.
+    
+    Uses PyAV (libx264, preset veryfast) when installed, otherwise
+    cv2.VideoWriter (mp4v). The small bounded queue lets the detection loop
+    continue while the previous frames are encoded. If encoding fails the
+    error is kept in `error`, later frames are dropped, and close() reports it.
+    """
+    
+    QUEUE_SIZE: int = 4
+    
+    def __init__(self, path: str, fps: float = 30.0):
+        super().__init__(name="frame-recorder", daemon=True)
+        self.path = path
+        self.fps = fps
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._end_seen = False
+        self.error: Optional[Exception] = None
+    
+    def write(self, frame: np.ndarray):
+        """Queue a BGR frame; blocks only when the encoder is QUEUE_SIZE frames behind."""
+        if self.error is not None or not self.is_alive():
+            return
+        self._queue.put(frame)
+    
+    def close(self):
+        """Encode the remaining frames and finalize the file."""
+        if self.is_alive():
+            self._queue.put(None)
+            self.join()
+        if self.error is not None:
+            print(f"❌ Recording to {self.path} failed: {self.error}")
+    
+    def run(self):
+        try:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            h, w = frame.shape[:2]
+            try:
+                import av
+            except ImportError:
+                print("⚠️ PyAV not installed, recording with cv2.VideoWriter (mp4v)")
+                self._run_opencv(frame, w, h)
+            else:
+                self._run_pyav(av, frame, w, h)
+        except Exception as e:
+            self.error = e
+            print(f"❌ Recorder error, dropping further frames: {e}")
+            # Keep consuming until close() so write()/close() never block
+            while not self._end_seen:
+                self._next_frame()
+    
+    def _next_frame(self) -> Optional[np.ndarray]:
+        frame = self._queue.get()
+        if frame is None:
+            self._end_seen = True
+        return frame
+    
+    def _frames(self, first: np.ndarray):
+        frame = first
+        while frame is not None:
+            yield frame
+            frame = self._next_frame()
+    
+    def _run_pyav(self, av: Any, first: np.ndarray, w: int, h: int):
+        container = av.open(self.path, "w")
+        try:
+            stream = container.add_stream("libx264", rate=max(1, round(self.fps)))
+            # yuv420p needs even dimensions
+            stream.width, stream.height = w - w % 2, h - h % 2
+            stream.pix_fmt = "yuv420p"
+            stream.options = {"preset": "veryfast"}
+            for frame in self._frames(first):
+                video_frame = av.VideoFrame.from_ndarray(
+                    frame[:stream.height, :stream.width], format="bgr24"
+                )
+                container.mux(stream.encode(video_frame))
+            container.mux(stream.encode(None))  # Flush delayed packets
+        finally:
+            container.close()
+    
+    def _run_opencv(self, first: np.ndarray, w: int, h: int):
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*"mp4v"), self.fps, (w, h))
+        try:
+            for frame in self._frames(first):
+                writer.write(frame)
+        finally:
+            writer.release()
+
+
 def process_video(
     video_path: str,
     vehicle_model: Any = None,
@@ -1006,29 +2074,42 @@ def process_video(
     skip_frames: int = 0,
     max_frames: Optional[int] = None,
     enable_plate_detection: bool = True,
+    hw_decode: bool = True,
+    source_id: str = DEFAULT_SOURCE_ID,
 ) -> Generator[FrameResult, None, None]:
-    """Process a video file with full detection pipeline."""
-    global _frame_counter, _prev_detections, _prev_plate_boxes
+    """
+    Process a video file with full detection pipeline.
     
-    _frame_counter = 0
-    _prev_detections = []
-    _prev_plate_boxes = []
+    hw_decode tries GPU video decoding first (see open_capture). Starts
+    from fresh state for source_id; other sources are left alone.
+    """
+    _sources.pop(source_id, None)
     
     if vehicle_model is None:
         vehicle_model = load_vehicle_model()
     if plate_model is None and enable_plate_detection:
         plate_model = load_plate_model()
     
-    cap = cv2.VideoCapture(video_path)
+    # Live sources: always process the newest frame and drop stale ones.
+    # Files: decode ahead on a background thread while inference runs
+    live = is_live_source(video_path)
+    cap = LatestFrameReader(video_path, hw_decode) if live else open_capture(video_path, hw_decode)
     if not cap.isOpened():
         raise ValueError(f"Could not open video: {video_path}")
+    if not live:
+        cap = PrefetchReader(cap)
+    cap.start()
     
     frame_id = 0
     processed = 0
     
     try:
         while True:
-            ret, frame = cap.read()
+            if live:
+                frame = cap.latest_frame()
+                ret = frame is not None
+            else:
+                ret, frame = cap.read()
             if not ret:
                 break
             
@@ -1043,6 +2124,7 @@ def process_video(
                 confidence=confidence,
                 plate_model=plate_model,
                 run_plate_detection=enable_plate_detection,
+                source_id=source_id,
             )
             
             yield result
@@ -1053,7 +2135,7 @@ def process_video(
             if max_frames and processed >= max_frames:
                 break
     finally:
-        cap.release()
+        cap.stop()
 
 
 # ============================================================================
@@ -1062,25 +2144,20 @@ def process_video(
 
 def reset_state():
     """Reset all global tracking state."""
-    global _frame_counter, _prev_detections, _prev_plate_boxes
-    global plate_history, ocr_cooldown, speed_history, parking_tracker, penalized_vehicles
-    
-    _frame_counter = 0
-    _prev_detections = []
-    _prev_plate_boxes = []
-    plate_history.clear()
-    ocr_cooldown.clear()
-    speed_history.clear()
-    parking_tracker.clear()
-    penalized_vehicles.clear()
+    _sources.clear()
+    _ocr_hash_cache.clear()
     
     print("🔄 Detection state reset")
 
 
 def set_parking_zones(zones: List[Dict]):
     """Update parking zones at runtime."""
-    global parking_zones
-    parking_zones = zones
+    global parking_zones, _zone_pts, _zone_off
+    parking_zones = [_with_polygon_array(z) for z in zones]
+    _zone_pts, _zone_off = _pack_polygons(parking_zones)
+    _zone_mask_cache.clear()
+    for state in _sources.values():
+        state.prev_detections = []  # cached zone indices refer to the old zone list
     print(f"📍 Updated parking zones: {len(zones)} zones")
 
 
@@ -1103,10 +2180,19 @@ if __name__ == "__main__":
     parser.add_argument("--confidence", type=float, default=0.5)
     parser.add_argument("--no-plates", action="store_true")
     parser.add_argument("--display", action="store_true")
+    parser.add_argument("--record", type=str, help="Write the annotated video to this path (e.g. out.mp4)")
+    parser.add_argument("--record-fps", type=float, default=30.0)
+    parser.add_argument("--verbose", action="store_true", help="Debug logging and a status line per frame")
     args = parser.parse_args()
     
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
+    # Without --verbose, print one averaged status line per this many frames
+    STATS_EVERY = 30
+    
     print("🚀 Full Integration Detection Pipeline")
-    print(f"   YOLO Interval: {YOLO_DETECTION_INTERVAL}")
+    print(f"   YOLO Interval: {YOLO_DETECTION_INTERVAL}-{YOLO_MAX_DETECTION_INTERVAL} (adaptive)")
     print(f"   Plate Interval: {PLATE_DETECTION_INTERVAL}")
     print(f"   OCR Cooldown: {OCR_COOLDOWN_SECONDS}s")
     print(f"   Speeding: {SPEEDING_THRESHOLD_PIXELS} px/s")
@@ -1121,6 +2207,16 @@ if __name__ == "__main__":
     print(f"📹 Processing: {video_path}")
     reset_state()
     
+    recorder = None
+    if args.record:
+        recorder = FrameRecorder(args.record, args.record_fps)
+        recorder.start()
+        print(f"💾 Recording to: {args.record}")
+    
+    stats_frames = 0
+    stats_ms = 0.0
+    stats_vehicles = 0
+    
     for result in process_video(
         video_path,
         vehicle_model=vehicle_model,
@@ -1131,13 +2227,27 @@ if __name__ == "__main__":
         annotated = draw_detections(result.image, result)
         annotated = draw_frame_info(annotated, result)
         
-        print(f"F{result.frame_id}: V={result.vehicle_count} P={len(result.plate_boxes)} S={result.speeding_count} Park={result.parking_warnings}/{result.parking_violations} {result.inference_time_ms:.0f}ms")
+        if args.verbose:
+            print(f"F{result.frame_id}: V={result.vehicle_count} P={len(result.plate_boxes)} Park={result.parking_warnings}/{result.parking_violations} {result.inference_time_ms:.0f}ms")
+        else:
+            stats_frames += 1
+            stats_ms += result.inference_time_ms
+            stats_vehicles += result.vehicle_count
+            if stats_frames == STATS_EVERY:
+                print(f"F{result.frame_id}: avg V={stats_vehicles / stats_frames:.1f} Park={result.parking_warnings}/{result.parking_violations} {stats_ms / stats_frames:.0f}ms/frame")
+                stats_frames, stats_ms, stats_vehicles = 0, 0.0, 0
+        
+        if recorder is not None:
+            recorder.write(annotated)
         
         if args.display:
             cv2.imshow("Detection", annotated)
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
     
+    if recorder is not None:
+        recorder.close()
+    
     if args.display:
         cv2.destroyAllWindows()
     
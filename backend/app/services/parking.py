@@ -12,7 +12,7 @@ from enum import Enum
 import cv2
 import numpy as np
 
-from app.services.detection import Detection
+from app.services.detection import Detection, points_in_polygons
 
 
 class ZoneType(str, Enum):
@@ -37,6 +37,8 @@ class ParkingZone:
         max_duration_sec: Maximum allowed parking duration (0 = no parking allowed)
         color: Display color for visualization (BGR)
         active: Whether this zone is currently being monitored
+        polygon_np: Polygon as a contiguous (N, 2) int32 array, built once
+        bbox: Axis-aligned bounds (xmin, ymin, xmax, ymax) of the polygon
     """
     zone_id: str
     name: str
@@ -45,11 +47,19 @@ class ParkingZone:
     max_duration_sec: float = 0.0  # 0 = no parking allowed
     color: Tuple[int, int, int] = (0, 0, 255)  # Red by default
     active: bool = True
+    polygon_np: np.ndarray = field(init=False, repr=False, compare=False)
+    bbox: Tuple[int, int, int, int] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Build the vertex array once instead of on every hit test / draw
+        self.polygon_np = np.ascontiguousarray(self.polygon, dtype=np.int32).reshape(-1, 2)
+        xmin, ymin = self.polygon_np.min(axis=0)
+        xmax, ymax = self.polygon_np.max(axis=0)
+        self.bbox = (int(xmin), int(ymin), int(xmax), int(ymax))
     
     def contains_point(self, point: Tuple[int, int]) -> bool:
         """Check if a point is inside the polygon."""
-        polygon_np = np.array(self.polygon, dtype=np.int32)
-        result = cv2.pointPolygonTest(polygon_np, point, False)
+        result = cv2.pointPolygonTest(self.polygon_np, point, False)
         return result >= 0  # >= 0 means inside or on edge
     
     def contains_centroid(self, detection: Detection) -> bool:
@@ -76,9 +86,13 @@ class ParkingZone:
         if mask_w <= 0 or mask_h <= 0:
             return 0.0
         
+        # Coarse rejection: no overlap if the bounding boxes are disjoint
+        zx1, zy1, zx2, zy2 = self.bbox
+        if x2 < zx1 or x1 > zx2 or y2 < zy1 or y1 > zy2:
+            return 0.0
+        
         # Translate polygon to bbox coordinate space
-        translated_poly = [(p[0] - x1, p[1] - y1) for p in self.polygon]
-        poly_np = np.array(translated_poly, dtype=np.int32)
+        poly_np = self.polygon_np - np.array((x1, y1), dtype=np.int32)
         
         # Create masks
         zone_mask = np.zeros((mask_h, mask_w), dtype=np.uint8)
@@ -204,18 +218,40 @@ class ParkingDetector:
         self.violation_callback = violation_callback
         self._violation_counter = 0
         
+        # Packed zone geometry for batched hit tests (rebuilt on zone changes)
+        self._zone_ids: List[str] = []
+        self._poly_pts = np.empty((0, 2), dtype=np.int32)
+        self._poly_off = np.zeros(1, dtype=np.int64)
+        self._zone_bboxes = np.empty((0, 4), dtype=np.int32)
+        
         if zones:
             for zone in zones:
                 self.add_zone(zone)
     
+    def _pack_zones(self) -> None:
+        """Concatenate all zone polygons into one vertex buffer plus offsets."""
+        self._zone_ids = list(self.zones.keys())
+        polygons = [self.zones[zid].polygon_np for zid in self._zone_ids]
+        if polygons:
+            self._poly_pts = np.concatenate(polygons)
+            self._poly_off = np.cumsum([0] + [len(p) for p in polygons])
+        else:
+            self._poly_pts = np.empty((0, 2), dtype=np.int32)
+            self._poly_off = np.zeros(1, dtype=np.int64)
+        self._zone_bboxes = np.array(
+            [self.zones[zid].bbox for zid in self._zone_ids], dtype=np.int32
+        ).reshape(-1, 4)
+    
     def add_zone(self, zone: ParkingZone) -> None:
         """Add a parking zone to monitor."""
         self.zones[zone.zone_id] = zone
+        self._pack_zones()
     
     def remove_zone(self, zone_id: str) -> bool:
         """Remove a parking zone."""
         if zone_id in self.zones:
             del self.zones[zone_id]
+            self._pack_zones()
             return True
         return False
     
@@ -253,19 +289,42 @@ class ParkingDetector:
         new_violations = []
         active_keys = set()
         
+        # Skip detections without valid track ID
+        detections = [
+            d for d in detections
+            if d.track_id is not None and d.track_id >= 0
+        ]
+        
+        # Coarse rejection against zone bounding boxes, vectorized over all pairs
+        centroids = np.array([d.centroid for d in detections], dtype=np.float64).reshape(-1, 2)
+        boxes = np.array([d.bbox for d in detections], dtype=np.int32).reshape(-1, 4)
+        zx1, zy1, zx2, zy2 = (self._zone_bboxes[:, i] for i in range(4))
+        cx, cy = centroids[:, 0:1], centroids[:, 1:2]
+        in_bbox = (cx >= zx1) & (cx <= zx2) & (cy >= zy1) & (cy <= zy2)
+        bbox_overlaps = (
+            (boxes[:, 2:3] >= zx1) & (boxes[:, 0:1] <= zx2)
+            & (boxes[:, 3:4] >= zy1) & (boxes[:, 1:2] <= zy2)
+        )
+        
+        # Exact centroid-in-zone test only for centroids inside some zone bbox
+        centroid_mask = np.zeros_like(in_bbox)
+        candidates = in_bbox.any(axis=1)
+        if candidates.any():
+            centroid_mask[candidates] = in_bbox[candidates] & points_in_polygons(
+                centroids[candidates], self._poly_pts, self._poly_off
+            )
+        
         # Check each detection against each active zone
-        for detection in detections:
-            if detection.track_id is None or detection.track_id < 0:
-                continue  # Skip detections without valid track ID
-            
-            for zone_id, zone in self.zones.items():
+        for m, detection in enumerate(detections):
+            for k, zone_id in enumerate(self._zone_ids):
+                zone = self.zones[zone_id]
                 if not zone.active:
                     continue
                 
                 # Check if vehicle is in zone (by centroid or overlap)
-                in_zone = zone.contains_centroid(detection)
+                in_zone = bool(centroid_mask[m, k])
                 
-                if not in_zone:
+                if not in_zone and bbox_overlaps[m, k]:
                     # Also check by overlap ratio for larger vehicles
                     overlap = zone.get_overlap_ratio(detection.bbox)
                     in_zone = overlap >= self.min_overlap
@@ -370,7 +429,7 @@ class ParkingDetector:
         annotated = frame.copy()
         
         # Draw zone polygon
-        pts = np.array(zone.polygon, dtype=np.int32)
+        pts = zone.polygon_np
         cv2.polylines(annotated, [pts], True, zone.color, 2)
         cv2.fillPoly(annotated, [pts], (*zone.color[:3], 50))  # Semi-transparent fill
         
@@ -412,7 +471,7 @@ class ParkingDetector:
             if not zone.active:
                 continue
             
-            pts = np.array(zone.polygon, dtype=np.int32)
+            pts = zone.polygon_np
             
             # Semi-transparent fill
             cv2.fillPoly(overlay, [pts], zone.color)
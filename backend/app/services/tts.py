@@ -4,18 +4,33 @@ Uses edge-tts for natural voices with pyttsx3 as offline fallback.
 """
 
 import os
+import ssl
 import sys
+import json
+import time
+import atexit
+import socket
+import string
+import shutil
+import wave
 import asyncio
 import subprocess
+import tempfile
+import concurrent.futures
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import threading
 import hashlib
+import importlib.util
+from collections import OrderedDict
 
 # Determine paths
 TTS_DIR = Path(__file__).parent
 WARNINGS_DIR = TTS_DIR / "warnings"
+# Synthesized audio keyed by a 64-bit blake2b of voice + text: repeated warnings skip edge-tts
+CACHE_DIR = WARNINGS_DIR / "cache"
 
 # Pre-cached common warning messages (text -> filename)
 COMMON_WARNINGS: Dict[str, str] = {
@@ -25,6 +40,114 @@ COMMON_WARNINGS: Dict[str, str] = {
     "general_warning": "Traffic violation detected.",
 }
 
+# Phrase fragments for templated warnings ("Vehicle" + plate chars + suffix).
+# Synthesized once (and cached) so dynamic warnings are built by joining MP3
+# bytes instead of calling edge-tts per plate; edge-tts always emits the same
+# MP3 format, so the frames concatenate cleanly.
+TEMPLATE_PHRASES: Dict[str, str] = {
+    "vehicle": "Vehicle",
+    "parking_warning": "please move immediately. You are in a no parking zone.",
+    "parking_violation": "violation recorded. Fine has been issued.",
+    "speeding_warning": "you are exceeding the speed limit.",
+}
+TEMPLATE_CHARS: str = string.ascii_uppercase + string.digits
+
+# With ffmpeg installed, fragments are transcoded once to raw PCM (cached as
+# <hash>.pcm plus a JSON sidecar) and templated warnings are written as WAV:
+# byte-exact joins with no MP3 frame boundaries and no decoder start-up
+PCM_FRAGMENTS: bool = True
+PCM_SAMPLE_RATE: int = 16000
+PCM_CHANNELS: int = 1
+
+# Seconds to wait for a persistent mpv's IPC endpoint to appear
+PLAYER_IPC_TIMEOUT_SECONDS: float = 2.0
+
+# Background coroutines consuming the synthesis queue (one per common warning,
+# so the startup prewarm runs fully in parallel)
+SYNTHESIS_WORKERS: int = 4
+
+# Max time a sync generate_warning() waits for edge-tts synthesis
+SYNTHESIS_TIMEOUT_SECONDS: float = 10.0
+
+# Players that can decode MP3 from stdin, in order of preference
+STREAM_PLAYERS: List[List[str]] = [
+    ["mpv", "--no-cache", "--no-terminal", "--", "fd://0"],
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"],
+    ["mpg123", "-q", "-"],
+]
+
+
+@lru_cache(maxsize=4096)
+def _text_hash(voice: str, text: str) -> str:
+    """blake2b-64 of voice + text; warning texts repeat, so memoize the digest."""
+    return hashlib.blake2b(f"{voice}\n{text}".encode(), digest_size=8).hexdigest()
+
+
+def _scan_by_mtime(directory: Path) -> "OrderedDict[str, Path]":
+    """The *.mp3/*.wav files in a directory by name, least recently modified first."""
+    entries = [e for e in os.scandir(directory) if e.is_file() and e.name.endswith((".mp3", ".wav"))]
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    return OrderedDict((e.name, Path(e.path)) for e in entries)
+
+
+def _transcode_to_pcm(mp3_bytes: bytes) -> Optional[bytes]:
+    """Decode MP3 to PCM_SAMPLE_RATE/PCM_CHANNELS s16le with one ffmpeg run."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-f", "mp3", "-i", "-",
+             "-ar", str(PCM_SAMPLE_RATE), "-ac", str(PCM_CHANNELS), "-f", "s16le", "-"],
+            input=mp3_bytes,
+            capture_output=True,
+            timeout=SYNTHESIS_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"[TTS] ffmpeg transcode failed: {e}")
+        return None
+    if result.returncode != 0 or not result.stdout:
+        print(f"[TTS] ffmpeg transcode failed: {result.stderr.decode(errors='replace').strip()}")
+        return None
+    return result.stdout
+
+
+def _audio_size(filepath: Path) -> int:
+    """Size of an audio file in bytes, 0 if missing (one stat call)."""
+    try:
+        return filepath.stat().st_size
+    except OSError:
+        return 0
+
+
+class _SharedSSL:
+    """
+    Stand-in for the ssl module inside edge_tts.communicate.
+    
+    edge-tts builds a new default SSL context (parsing the certifi CA bundle,
+    tens of ms) for every request; this hands out one shared context and
+    forwards everything else to the real ssl module.
+    """
+    
+    def __init__(self, context: ssl.SSLContext):
+        self._context = context
+    
+    def create_default_context(self, *args, **kwargs) -> ssl.SSLContext:
+        return self._context
+    
+    def __getattr__(self, name: str):
+        return getattr(ssl, name)
+
+
+def _share_edge_tts_ssl_context():
+    """Make edge-tts reuse one SSL context across requests (best effort)."""
+    try:
+        import certifi
+        from edge_tts import communicate
+        if isinstance(communicate.ssl, _SharedSSL):
+            return
+        context = ssl.create_default_context(cafile=certifi.where())
+        communicate.ssl = _SharedSSL(context)
+    except Exception as e:
+        print(f"[TTS] Could not share SSL context: {e}")
+
 
 class TTSService:
     """
@@ -43,37 +166,170 @@ class TTSService:
         """
         self.voice = voice
         self._ensure_directories()
+        # *.mp3 files in WARNINGS_DIR and CACHE_DIR in LRU order (oldest
+        # first), scanned once here and kept in sync by this service
+        self._lru = _scan_by_mtime(WARNINGS_DIR)
+        self._cache_lru = _scan_by_mtime(CACHE_DIR)
         self._edge_tts_available = self._check_edge_tts()
         self._pyttsx3_available = self._check_pyttsx3()
         self._pyttsx3_engine = None
         self._warning_cache: Dict[str, Path] = {}  # text_hash -> filepath
+        self._stream_player = self._find_stream_player()
+        self._pcm_fragments = PCM_FRAGMENTS and shutil.which("ffmpeg") is not None
+        
+        # One long-lived event loop for all edge-tts calls, so the loop (and
+        # edge-tts's DNS/TLS work) is not rebuilt for every warning
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="tts-loop", daemon=True
+        )
+        self._loop_thread.start()
+        
+        # Synthesis requests are queued to a few workers on that loop;
+        # concurrent requests for the same text share one synthesis
+        self._synthesis_queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._pending_lock = threading.Lock()
+        # Tasks still piping streamed audio into a player
+        self._feeders: set = set()
+        if self._edge_tts_available:
+            # First use of edge-tts happens on the loop thread, not here
+            self._loop.call_soon_threadsafe(_share_edge_tts_ssl_context)
+            for _ in range(SYNTHESIS_WORKERS):
+                asyncio.run_coroutine_threadsafe(self._synthesis_worker(), self._loop)
+        
+        # Small pool for fire-and-forget playback (player spawns / IPC writes)
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="tts-io"
+        )
+        
+        # One idle mpv fed over JSON IPC, instead of a player process per clip
+        self._player: Optional[subprocess.Popen] = None
+        self._player_ipc: Optional[str] = None
+        self._start_player()
+        atexit.register(self._stop_player)
+        
+        # Template fragments: key (phrase key or single char) -> MP3 bytes
+        self._fragments: Dict[str, bytes] = {}
+        if self._edge_tts_available:
+            asyncio.run_coroutine_threadsafe(self._prepare_fragments_async(), self._loop)
         
         print(f"🔊 TTS Service initialized")
         print(f"   Voice: {self.voice}")
         print(f"   Warnings dir: {WARNINGS_DIR}")
         print(f"   edge-tts: {self._edge_tts_available}")
         print(f"   pyttsx3: {self._pyttsx3_available}")
+        print(f"   stream player: {self._stream_player[0] if self._stream_player else None}")
+        print(f"   persistent player: {self._player_ipc is not None}")
+        print(f"   PCM fragments: {self._pcm_fragments}")
         
-        # Pre-load cached warning files
+        # Pre-load cached warning files (synthesizing missing ones)
+        self._prewarm: Optional[concurrent.futures.Future] = None
         self._preload_common_warnings()
     
     def _preload_common_warnings(self):
-        """Load existing warning files into cache for instant playback."""
-        if not WARNINGS_DIR.exists():
-            return
+        """
+        Load existing warning files into cache for instant playback.
         
+        Missing ones are synthesized concurrently on the background loop
+        without blocking; see wait_for_common_warnings().
+        """
+        missing = []
         # Look for common warning files
         for warning_key, text in COMMON_WARNINGS.items():
             filepath = WARNINGS_DIR / f"{warning_key}.mp3"
-            if filepath.exists():
+            if filepath.name in self._lru:
                 text_hash = self._hash_text(text)
                 self._warning_cache[text_hash] = filepath
                 self._warning_cache[warning_key] = filepath
                 print(f"   📦 Cached: {warning_key}.mp3")
+            else:
+                missing.append((warning_key, text))
+        
+        if missing and self._edge_tts_available:
+            self._prewarm = asyncio.run_coroutine_threadsafe(
+                self._prewarm_common_async(missing), self._loop
+            )
+    
+    async def _prewarm_common_async(self, missing: List[tuple]):
+        """Synthesize missing common warnings in parallel."""
+        results = await asyncio.gather(
+            *(self.generate_warning_async(text, key) for key, text in missing)
+        )
+        for (key, _), filepath in zip(missing, results):
+            if filepath is not None:
+                self._warning_cache[key] = filepath
+    
+    def wait_for_common_warnings(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the startup synthesis of COMMON_WARNINGS has finished.
+        
+        Returns:
+            True if every common warning is available for play_cached_warning
+        """
+        if self._prewarm is not None:
+            try:
+                self._prewarm.result(timeout=timeout)
+            except Exception as e:
+                print(f"[TTS] Common warning prewarm failed: {e!r}")
+        return all(key in self._warning_cache for key in COMMON_WARNINGS)
     
     def _hash_text(self, text: str) -> str:
-        """Generate a hash for caching text-based lookups."""
-        return hashlib.md5(text.lower().strip().encode()).hexdigest()[:16]
+        """Generate a hash for caching text-based lookups (per voice)."""
+        return _text_hash(self.voice, text)
+    
+    def _cached_audio(self, text: str) -> Optional[Path]:
+        """Return previously synthesized audio for this text, if any."""
+        text_hash = self._hash_text(text)
+        filepath = self._warning_cache.get(text_hash)
+        if filepath is None:
+            filepath = CACHE_DIR / f"{text_hash}.mp3"
+            if _audio_size(filepath) == 0:
+                return None
+            self._warning_cache[text_hash] = filepath
+        try:
+            # Recently used: survives cleanup_old_warnings (also across
+            # restarts, via mtime). Doubles as the existence check for
+            # entries already in the in-memory cache.
+            os.utime(filepath)
+        except FileNotFoundError:
+            del self._warning_cache[text_hash]
+            return None
+        except OSError:
+            pass
+        if filepath.name in self._cache_lru:
+            self._cache_lru.move_to_end(filepath.name)
+        return filepath
+    
+    def _cache_audio(self, text: str, tmp_path: Path) -> Optional[Path]:
+        """Atomically install a finished synthesis into the cache."""
+        if _audio_size(tmp_path) == 0:
+            tmp_path.unlink()
+            return None
+        text_hash = self._hash_text(text)
+        filepath = CACHE_DIR / f"{text_hash}.mp3"
+        os.replace(tmp_path, filepath)
+        self._warning_cache[text_hash] = filepath
+        self._cache_lru[filepath.name] = filepath
+        return filepath
+    
+    def _store_audio(self, text: str, audio: bytearray) -> Optional[Path]:
+        """Write a complete synthesis with a single write and cache it."""
+        if not audio:
+            return None
+        with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".part", delete=False) as f:
+            f.write(audio)
+        return self._cache_audio(text, Path(f.name))
+    
+    def _deliver(self, filepath: Path, filename: Optional[str]) -> Path:
+        """Hand out cached audio, copied to WARNINGS_DIR when a filename was asked for."""
+        if filename is None:
+            return filepath
+        target = self._warning_path(filename)
+        if target != filepath:
+            shutil.copyfile(filepath, target)
+            self._remember(target)
+        return target
     
     def play_cached_warning(self, warning_key: str) -> bool:
         """
@@ -92,7 +348,7 @@ class TTSService:
         
         # Try to find the file directly
         filepath = WARNINGS_DIR / f"{warning_key}.mp3"
-        if filepath.exists():
+        if filepath.name in self._lru:
             self._warning_cache[warning_key] = filepath
             return self.play_audio(filepath)
         
@@ -103,42 +359,63 @@ class TTSService:
         ]
         for alt in alt_names:
             alt_path = WARNINGS_DIR / alt
-            if alt_path.exists():
+            if alt in self._lru:
                 self._warning_cache[warning_key] = alt_path
                 return self.play_audio(alt_path)
         
         print(f"[TTS] ⚠️ No cached audio for: {warning_key}")
         return False
     
+    def play_cached_warning_nowait(self, warning_key: str) -> concurrent.futures.Future:
+        """
+        Start play_cached_warning on the service's I/O pool and return at once.
+        
+        The returned future resolves to play_cached_warning's result;
+        callers that do not need it can ignore it.
+        """
+        return self._io_pool.submit(self.play_cached_warning, warning_key)
+    
     def play_any_warning(self) -> bool:
         """Play any available warning file (for testing)."""
-        if WARNINGS_DIR.exists():
-            files = list(WARNINGS_DIR.glob("*.mp3"))
-            if files:
-                return self.play_audio(files[0])
+        for filepath in self._lru.values():
+            return self.play_audio(filepath)
         return False
     
+    def _remember(self, filepath: Path):
+        """Record a file just written to WARNINGS_DIR as the most recent."""
+        self._lru[filepath.name] = filepath
+        self._lru.move_to_end(filepath.name)
+    
     def _ensure_directories(self):
         """Create necessary directories."""
         if not WARNINGS_DIR.exists():
             WARNINGS_DIR.mkdir(parents=True, exist_ok=True)
             print(f"📁 Created warnings directory: {WARNINGS_DIR}")
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
     
     def _check_edge_tts(self) -> bool:
-        """Check if edge-tts is installed."""
-        try:
-            import edge_tts
-            return True
-        except ImportError:
-            return False
+        """Check if edge-tts is installed (without importing it)."""
+        return importlib.util.find_spec("edge_tts") is not None
     
     def _check_pyttsx3(self) -> bool:
-        """Check if pyttsx3 is installed."""
-        try:
-            import pyttsx3
-            return True
-        except ImportError:
-            return False
+        """Check if pyttsx3 is installed (without importing it)."""
+        return importlib.util.find_spec("pyttsx3") is not None
+    
+    def _find_stream_player(self) -> Optional[List[str]]:
+        """Find an installed player that can play MP3 piped to its stdin."""
+        for cmd in STREAM_PLAYERS:
+            if shutil.which(cmd[0]):
+                return cmd
+        return None
+    
+    def _warning_path(self, filename: Optional[str], suffix: str = ".mp3") -> Path:
+        """Resolve the audio path for a warning (timestamp-based name if None)."""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filename = f"warning_{timestamp}"
+        if not filename.endswith(suffix):
+            filename = f"{filename}{suffix}"
+        return WARNINGS_DIR / filename
     
     def _get_pyttsx3_engine(self):
         """Get or create pyttsx3 engine (lazy initialization)."""
@@ -160,6 +437,9 @@ class TTSService:
         """
         Generate a warning audio file asynchronously.
         
+        Text already synthesized with this voice is served from CACHE_DIR
+        without calling edge-tts.
+        
         Args:
             text: The text to convert to speech
             filename: Optional filename (without extension). 
@@ -168,45 +448,237 @@ class TTSService:
         Returns:
             Path to the generated MP3 file, or None if failed
         """
+        cached = self._cached_audio(text)
+        if cached is not None:
+            return self._deliver(cached, filename)
+        
         if not self._edge_tts_available:
             print(f"[TTS] ⚠️ edge-tts not available. Would say: {text}")
             return None
         
+        # Queued to the synthesis workers (usable from any event loop)
+        # Shielded: a cancelled/timed-out waiter must not cancel the shared
+        # future other callers (and the worker) are still using
+        filepath = await asyncio.shield(asyncio.wrap_future(self._submit_synthesis(text)))
+        if filepath is None:
+            return None
+        return self._deliver(filepath, filename)
+    
+    def _submit_synthesis(self, text: str) -> concurrent.futures.Future:
+        """Queue text for synthesis, joining an identical request already queued."""
+        with self._pending_lock:
+            future = self._pending.get(text)
+            if future is None:
+                future = self._pending[text] = concurrent.futures.Future()
+                self._loop.call_soon_threadsafe(self._synthesis_queue.put_nowait, (text, future))
+        return future
+    
+    async def _synthesis_worker(self):
+        """Synthesize queued texts one after another, forever."""
+        while True:
+            text, future = await self._synthesis_queue.get()
+            filepath = None
+            try:
+                filepath = await self._synthesize(text)
+            except Exception as e:
+                print(f"[TTS] ❌ Synthesis worker error: {e!r}")
+            finally:
+                with self._pending_lock:
+                    self._pending.pop(text, None)
+                # A waiter may have cancelled it; never let that kill the worker
+                if not future.done():
+                    future.set_result(filepath)
+    
+    async def _synthesize(self, text: str) -> Optional[Path]:
+        """Run edge-tts for text and install the result in the cache."""
         try:
             import edge_tts
             
-            # Generate filename if not provided
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                filename = f"warning_{timestamp}"
+            # Generate audio using subprocesses method for reliability
+            communicate = edge_tts.Communicate(text, self.voice)
             
-            # Ensure .mp3 extension
-            if not filename.endswith(".mp3"):
-                filename = f"{filename}.mp3"
+            # Collect the whole stream, then write it once; nothing touches
+            # the cache unless the synthesis completed
+            audio = bytearray()
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio += chunk["data"]
             
-            filepath = WARNINGS_DIR / filename
+            # Check if file was actually written
+            filepath = self._store_audio(text, audio)
+            if filepath is None:
+                print(f"[TTS] ⚠️ File empty or not created")
+                return None
+            print(f"[TTS] ✅ Generated: {filepath.name} ({filepath.stat().st_size} bytes)")
+            return filepath
+            
+        except Exception as e:
+            print(f"[TTS] ❌ Error generating audio: {e}")
+            return None
+    
+    async def speak_stream_async(
+        self,
+        text: str,
+        filename: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Synthesize and play a warning at the same time.
+        
+        Audio chunks from edge-tts are piped into an already running player
+        (mpv/ffplay/mpg123 reading stdin) as they arrive, so playback starts
+        with the first chunk instead of after the whole file is written.
+        The same bytes are saved to WARNINGS_DIR. Without a stream-capable
+        player this falls back to generate-then-play.
+        
+        The player is fed by a separate task at the pace it reads, so this
+        returns once synthesis is done (not when playback ends) and a full
+        pipe never blocks the event loop.
+        
+        Returns:
+            Path to the saved MP3 file, or None if failed
+        """
+        cached = self._cached_audio(text)
+        if cached is not None:
+            self.play_audio(cached)
+            return self._deliver(cached, filename)
+        
+        if not self._edge_tts_available:
+            print(f"[TTS] ⚠️ edge-tts not available. Would say: {text}")
+            return None
+        
+        if self._stream_player is None:
+            filepath = await self.generate_warning_async(text, filename)
+            if filepath:
+                self.play_audio(filepath)
+            return filepath
+        
+        try:
+            import edge_tts
             
-            # Generate audio using subprocesses method for reliability
             communicate = edge_tts.Communicate(text, self.voice)
             
-            # Use iterate and write manually for more reliability
-            with open(str(filepath), "wb") as f:
+            player = await asyncio.create_subprocess_exec(
+                *self._stream_player,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            chunks: asyncio.Queue = asyncio.Queue()
+            feeder = asyncio.ensure_future(self._feed_player(player, chunks))
+            # Keep a reference: the task outlives this call while audio plays
+            self._feeders.add(feeder)
+            feeder.add_done_callback(self._feeders.discard)
+            
+            audio = bytearray()
+            try:
                 async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        f.write(chunk["data"])
+                    if chunk["type"] != "audio":
+                        continue
+                    # Tee: each chunk goes to the player now, the file later
+                    audio += chunk["data"]
+                    chunks.put_nowait(chunk["data"])
+            finally:
+                chunks.put_nowait(None)
             
-            # Check if file was actually written
-            if filepath.exists() and filepath.stat().st_size > 0:
-                print(f"[TTS] ✅ Generated: {filepath.name} ({filepath.stat().st_size} bytes)")
-                return filepath
-            else:
+            filepath = self._store_audio(text, audio)
+            if filepath is None:
                 print(f"[TTS] ⚠️ File empty or not created")
                 return None
+            print(f"[TTS] 🔊 Streamed: {filepath.name} ({filepath.stat().st_size} bytes)")
+            return self._deliver(filepath, filename)
             
         except Exception as e:
-            print(f"[TTS] ❌ Error generating audio: {e}")
+            print(f"[TTS] ❌ Error streaming audio: {e}")
             return None
     
+    async def _feed_player(self, player: "asyncio.subprocess.Process", chunks: asyncio.Queue):
+        """Write queued MP3 chunks to a stream player's stdin until None."""
+        try:
+            while True:
+                data = await chunks.get()
+                if data is None:
+                    break
+                player.stdin.write(data)
+                await player.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass  # Player exited early; the file is still saved
+        finally:
+            try:
+                player.stdin.close()
+            except OSError:
+                pass
+            await player.wait()
+    
+    async def _prepare_fragments_async(self):
+        """Synthesize (or load from cache) every template fragment."""
+        fragments = {**TEMPLATE_PHRASES, **{c: c for c in TEMPLATE_CHARS}}
+        for key, text in fragments.items():
+            filepath = await self.generate_warning_async(text)
+            if filepath is None:
+                continue
+            if self._pcm_fragments:
+                # ffmpeg runs off the loop; a fragment that fails to
+                # transcode is left out rather than mixed in as MP3
+                audio = await self._loop.run_in_executor(None, self._fragment_pcm, text, filepath)
+            else:
+                audio = filepath.read_bytes()
+            if audio:
+                self._fragments[key] = audio
+    
+    def _fragment_pcm(self, text: str, mp3_path: Path) -> Optional[bytes]:
+        """PCM for a fragment, transcoded from its MP3 once and cached."""
+        pcm_path = CACHE_DIR / f"{self._hash_text(text)}.pcm"
+        meta_path = pcm_path.with_suffix(".json")
+        pcm_format = {"sr": PCM_SAMPLE_RATE, "ch": PCM_CHANNELS}
+        try:
+            if json.loads(meta_path.read_text()) == pcm_format:
+                return pcm_path.read_bytes()
+        except (OSError, ValueError):
+            pass
+        
+        pcm = _transcode_to_pcm(mp3_path.read_bytes())
+        if pcm:
+            pcm_path.write_bytes(pcm)
+            meta_path.write_text(json.dumps(pcm_format))
+        return pcm
+    
+    def speak_templated(self, prefix_key: str, plate: str, suffix_key: str) -> bool:
+        """
+        Play "<prefix> <plate spelled out> <suffix>" from cached fragments.
+        
+        No synthesis happens here: if any fragment is not ready yet, nothing
+        is played and False is returned so the caller can fall back.
+        
+        Args:
+            prefix_key: TEMPLATE_PHRASES key spoken first (e.g. 'vehicle')
+            plate: License plate, spoken one letter/digit at a time
+            suffix_key: TEMPLATE_PHRASES key spoken last (e.g. 'parking_warning')
+        """
+        keys = [prefix_key] + [c for c in plate.upper() if c.isalnum()] + [suffix_key]
+        # One file per distinct warning (named after its fragment sequence),
+        # replayed when the same plate is warned again
+        suffix = ".wav" if self._pcm_fragments else ".mp3"
+        filepath = self._warning_path(f"templated_{_text_hash(self.voice, ' '.join(keys))}", suffix)
+        if filepath.name in self._lru:
+            self._remember(filepath)
+            return self.play_audio(filepath)
+        
+        try:
+            audio = b"".join(self._fragments[key] for key in keys)
+        except KeyError:
+            return False
+        
+        if self._pcm_fragments:
+            with wave.open(str(filepath), "wb") as wav:
+                wav.setnchannels(PCM_CHANNELS)
+                wav.setsampwidth(2)
+                wav.setframerate(PCM_SAMPLE_RATE)
+                wav.writeframes(audio)
+        else:
+            filepath.write_bytes(audio)
+        self._remember(filepath)
+        return self.play_audio(filepath)
+    
     def generate_warning(
         self, 
         text: str, 
@@ -226,26 +698,27 @@ class TTSService:
         Returns:
             Path to the generated MP3 file, or None if failed
         """
+        cached = self._cached_audio(text)
+        if cached is not None:
+            if play_immediately:
+                self.play_audio(cached)
+            return self._deliver(cached, filename)
+        
         filepath = None
+        # Playing right away: stream the audio into the player while it downloads
+        streaming = play_immediately and self._stream_player is not None
+        synthesize = self.speak_stream_async if streaming else self.generate_warning_async
         
         # Try edge-tts first
         if self._edge_tts_available:
+            # Works from sync code and from inside a running event loop alike
+            future = asyncio.run_coroutine_threadsafe(synthesize(text, filename), self._loop)
             try:
-                # Check if we're already in an async event loop
-                try:
-                    loop = asyncio.get_running_loop()
-                    # We're in an async context - run in a new thread
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(
-                            lambda: asyncio.run(self.generate_warning_async(text, filename))
-                        )
-                        filepath = future.result(timeout=10)
-                except RuntimeError:
-                    # No event loop running - safe to use asyncio.run()
-                    filepath = asyncio.run(self.generate_warning_async(text, filename))
+                filepath = future.result(timeout=SYNTHESIS_TIMEOUT_SECONDS)
             except Exception as e:
-                print(f"[TTS] edge-tts failed: {e}")
+                future.cancel()
+                print(f"[TTS] edge-tts failed: {e!r}")
+        streamed = streaming and filepath is not None
         
         # Fallback to pyttsx3
         if filepath is None and self._pyttsx3_available:
@@ -256,7 +729,7 @@ class TTSService:
             self._speak_pyttsx3_direct(text)
             return None
         
-        if filepath and play_immediately:
+        if filepath and play_immediately and not streamed:
             self.play_audio(filepath)
         
         return filepath
@@ -268,20 +741,14 @@ class TTSService:
             if engine is None:
                 return None
             
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                filename = f"warning_{timestamp}"
-            
-            if not filename.endswith(".mp3"):
-                filename = f"{filename}.mp3"
-            
-            filepath = WARNINGS_DIR / filename
+            filepath = self._warning_path(filename)
             
             # pyttsx3 can save to file
             engine.save_to_file(text, str(filepath))
             engine.runAndWait()
             
-            if filepath.exists() and filepath.stat().st_size > 0:
+            if _audio_size(filepath) > 0:
+                self._remember(filepath)
                 print(f"[TTS] ✅ Generated (pyttsx3): {filepath.name}")
                 return filepath
             
@@ -306,14 +773,71 @@ class TTSService:
         except Exception as e:
             print(f"[TTS] pyttsx3 direct speak failed: {e}")
     
+    def _start_player(self):
+        """Start an idle mpv with a JSON IPC server, if mpv is installed."""
+        if not shutil.which("mpv"):
+            return
+        if sys.platform == "win32":
+            ipc_path = rf"\\.\pipe\itms-tts-{os.getpid()}"
+        else:
+            ipc_path = os.path.join(tempfile.gettempdir(), f"itms-tts-{os.getpid()}.sock")
+        try:
+            self._player = subprocess.Popen(
+                ["mpv", "--idle=yes", "--no-video", "--no-terminal",
+                 f"--input-ipc-server={ipc_path}"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            print(f"[TTS] Could not start mpv: {e}")
+            return
+        
+        deadline = time.monotonic() + PLAYER_IPC_TIMEOUT_SECONDS
+        while time.monotonic() < deadline and self._player.poll() is None:
+            if os.path.exists(ipc_path):
+                self._player_ipc = ipc_path
+                return
+            time.sleep(0.05)
+        print("[TTS] ⚠️ mpv IPC not available, spawning a player per clip")
+        self._stop_player()
+    
+    def _stop_player(self):
+        """Terminate the persistent mpv, if running."""
+        self._player_ipc = None
+        if self._player is not None and self._player.poll() is None:
+            self._player.terminate()
+        self._player = None
+    
+    def _play_via_ipc(self, filepath_str: str) -> bool:
+        """Queue a file on the persistent mpv; False if it is gone."""
+        if self._player_ipc is None or self._player is None or self._player.poll() is not None:
+            return False
+        # append-play: a new warning waits for the current one instead of cutting it off
+        message = json.dumps({"command": ["loadfile", filepath_str, "append-play"]}) + "\n"
+        try:
+            if sys.platform == "win32":
+                with open(self._player_ipc, "w") as pipe:
+                    pipe.write(message)
+            else:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(self._player_ipc)
+                    sock.sendall(message.encode())
+            return True
+        except OSError as e:
+            print(f"[TTS] mpv IPC failed, falling back to a player per clip: {e}")
+            self._stop_player()
+            return False
+    
     def play_audio(self, filepath: Path) -> bool:
         """
         Play an audio file in the background.
         
-        Platform-specific implementation:
+        Uses the persistent mpv (loadfile over its IPC socket) when running,
+        otherwise a platform-specific player process:
         - Windows: Uses 'start /min' for background playback
         - macOS: Uses 'afplay'
-        - Linux: Uses 'mpg123'
+        - Linux: Uses 'mpg123' ('aplay' for WAV)
         
         Args:
             filepath: Path to the audio file
@@ -328,6 +852,10 @@ class TTSService:
         try:
             filepath_str = str(filepath.absolute())
             
+            if self._play_via_ipc(filepath_str):
+                print(f"[TTS] 🔊 Playing: {filepath.name}")
+                return True
+            
             if sys.platform == "win32":
                 # Windows: Play in background using subprocess (non-blocking)
                 # Use CREATE_NO_WINDOW flag to prevent console popup
@@ -346,9 +874,10 @@ class TTSService:
                     stderr=subprocess.DEVNULL
                 )
             else:
-                # Linux: Use mpg123 in quiet mode, background
+                # Linux: Use mpg123 (aplay for WAV) in quiet mode, background
+                player = 'aplay' if filepath.suffix == ".wav" else 'mpg123'
                 subprocess.Popen(
-                    ['mpg123', '-q', filepath_str],
+                    [player, '-q', filepath_str],
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL
                 )
@@ -373,40 +902,70 @@ class TTSService:
         """
         return self.generate_warning(text, play_immediately=play)
     
+    def close(self):
+        """Stop the background event loop, the I/O pool and the persistent player."""
+        self._io_pool.shutdown(wait=False)
+        self._stop_player()
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=2.0)
+    
     def get_warning_count(self) -> int:
         """Get the number of warning files generated."""
-        if WARNINGS_DIR.exists():
-            return len(list(WARNINGS_DIR.glob("*.mp3")))
-        return 0
+        return len(self._lru)
     
-    def cleanup_old_warnings(self, max_files: int = 100):
+    def cleanup_old_warnings(self, max_files: int = 100, max_cached: int = 500):
         """
         Remove old warning files to prevent disk buildup.
         
+        Evicts from the head of the in-memory LRU lists, so no directory
+        scan or per-file stat is needed.
+        
         Args:
             max_files: Maximum number of files to keep
+            max_cached: Maximum number of synthesis cache entries to keep
+                (least recently used are removed first)
         """
-        if not WARNINGS_DIR.exists():
-            return
-        
-        files = sorted(WARNINGS_DIR.glob("*.mp3"), key=lambda f: f.stat().st_mtime)
+        removed = self._evict(self._lru, max_files)
+        if removed:
+            print(f"[TTS] 🧹 Cleaned up {removed} old warning files")
         
-        if len(files) > max_files:
-            to_delete = files[:-max_files]
-            for f in to_delete:
-                f.unlink()
-            print(f"[TTS] 🧹 Cleaned up {len(to_delete)} old warning files")
+        removed = self._evict(self._cache_lru, max_cached)
+        if removed:
+            print(f"[TTS] 🧹 Evicted {removed} cached syntheses")
+    
+    @staticmethod
+    def _evict(lru: "OrderedDict[str, Path]", max_files: int) -> int:
+        """Delete the oldest files until at most max_files remain."""
+        removed = 0
+        while len(lru) > max_files:
+            _, filepath = lru.popitem(last=False)
+            try:
+                filepath.unlink()
+            except FileNotFoundError:
+                pass
+            # Transcoded fragment audio lives next to its cached MP3
+            for sidecar in (".pcm", ".json"):
+                filepath.with_suffix(sidecar).unlink(missing_ok=True)
+            removed += 1
+        return removed
 
 
 # Global TTS service instance
 _tts_service: Optional[TTSService] = None
+_tts_service_lock = threading.Lock()
 
 
 def get_tts_service() -> TTSService:
     """Get or create the global TTS service instance."""
     global _tts_service
-    if _tts_service is None:
-        _tts_service = TTSService()
+    if _tts_service is not None:
+        return _tts_service
+    # Construction starts threads and a player; concurrent first callers
+    # must not each build a service
+    with _tts_service_lock:
+        if _tts_service is None:
+            _tts_service = TTSService()
     return _tts_service
 
 
@@ -0,0 +1,83 @@
+"""
+Export the vehicle and plate YOLO models to TensorRT engines.
+
+Engines are written next to the weights as <stem>.<precision>.engine, which
+is where load_model looks for them. Run once per machine (engines are tied
+to the GPU and TensorRT version), then start the backend with
+MODEL_PRECISION set to the same precision.
+
+Usage:
+    python scripts/export_engines.py --precision fp16
+    python scripts/export_engines.py --plate-precision int8 --calibration-data vehicle_crops.yaml
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path so `app` imports work when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import get_settings
+from app.services.detection import (
+    export_tensorrt_engine,
+    cuda_available,
+    ENGINE_PLATE_BATCH,
+    ENGINE_VEHICLE_BATCH,
+    MODEL_WARMUP_SIZE,
+    PLATE_CROP_SIZE,
+)
+
+settings = get_settings()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export YOLO models to TensorRT engines")
+    parser.add_argument("--device", default="cuda:0")
+    parser.add_argument("--precision", choices=["fp16", "int8"], default="fp16",
+                        help="Precision for the vehicle model")
+    parser.add_argument("--plate-precision", choices=["fp16", "int8"], default=None,
+                        help="Precision for the plate model (default: same as --precision)")
+    parser.add_argument("--vehicle-batch", type=int, default=ENGINE_VEHICLE_BATCH)
+    parser.add_argument("--plate-batch", type=int, default=ENGINE_PLATE_BATCH)
+    parser.add_argument("--imgsz", type=int, default=MODEL_WARMUP_SIZE, help="Vehicle model input size")
+    parser.add_argument("--plate-imgsz", type=int, default=PLATE_CROP_SIZE,
+                        help="Plate model input size (default: the size detection uses)")
+    parser.add_argument("--calibration-data", default=None,
+                        help="Dataset YAML of sample frames/crops for INT8 calibration")
+    parser.add_argument("--force", action="store_true", help="Re-export even if an engine exists")
+    args = parser.parse_args()
+    
+    if not cuda_available(args.device):
+        print(f"❌ CUDA device '{args.device}' not available - TensorRT export needs a GPU")
+        sys.exit(1)
+    
+    if args.calibration_data:
+        settings.int8_calibration_data = args.calibration_data
+    
+    exports = [
+        (settings.models_dir / settings.vehicle_model, args.precision, args.imgsz, args.vehicle_batch),
+        (settings.models_dir / settings.plate_model, args.plate_precision or args.precision,
+         args.plate_imgsz, args.plate_batch),
+    ]
+    
+    for weights, precision, imgsz, batch in exports:
+        if not weights.exists():
+            print(f"⚠️ Skipping {weights}: weights not found")
+            continue
+        
+        engine = export_tensorrt_engine(
+            str(weights), args.device, precision,
+            imgsz=imgsz, batch=batch, dynamic=True, force=args.force,
+        )
+        if engine:
+            print(f"✅ {weights.name} -> {engine}")
+    
+    plate_precision = args.plate_precision or args.precision
+    print(f"\nStart the backend with MODEL_PRECISION={args.precision}"
+          + (f" PLATE_MODEL_PRECISION={plate_precision}" if plate_precision != args.precision else "")
+          + " to load the engines.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
 
 import os
-import random
+import stat
+import hashlib
 import subprocess
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 
 # Configuration
 START_DATE = datetime(2025, 12, 15)
 END_DATE = datetime(2026, 1, 2)
+# Commit times are UTC epoch seconds from here on (fast-import raw dates)
+START_EPOCH = int(START_DATE.replace(tzinfo=timezone.utc).timestamp())
+SECONDS_PER_DAY = 86400
 BRANCH_NAME = "feature/ranidu/parking-violation-detection"
+# Seed for the schedule generator (same seed -> same history)
+RANDOM_SEED = 42
+
+# Commits per active day, weighted towards 4-6
+COMMITS_PER_DAY = np.arange(2, 10)
+COMMITS_PER_DAY_WEIGHTS = np.array([1, 2, 4, 5, 4, 3, 2, 1], dtype=float)
 
 # File groups to commit progressively
 FILE_GROUPS = [
@@ -95,125 +107,231 @@ GENERIC_MESSAGES = [
     "Update detection model weights path"
 ]
 
-def run_command(cmd):
-    subprocess.run(cmd, shell=True, check=True)
-
-def git_commit(date, message):
-    date_str = date.strftime("%Y-%m-%d %H:%M:%S")
-    env = os.environ.copy()
-    env["GIT_AUTHOR_DATE"] = date_str
-    env["GIT_COMMITTER_DATE"] = date_str
-    
-    # Check if anything is staged
-    status = subprocess.run("git diff --cached --quiet", shell=True)
-    if status.returncode == 0:
-        # Nothing staged, make a dummy change
-        with open("backend/COMMIT_LOG.txt", "a") as f:
-            f.write(f"Commit on {date_str}: {message}\n")
-        subprocess.run(f"git add backend/COMMIT_LOG.txt", shell=True)
+def git_output(*args):
+    return subprocess.run(["git", *args], check=True, capture_output=True).stdout
+
+
+def blob_sha(data):
+    """Object id git gives a blob with this content (no git call needed)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def read_worktree_file(path):
+    """(mode, content) of a working tree file as git would store it."""
+    st = os.lstat(path)
+    if stat.S_ISLNK(st.st_mode):
+        return "120000", os.fsencode(os.readlink(path))
+    mode = "100755" if st.st_mode & 0o111 else "100644"
+    with open(path, "rb") as f:
+        return mode, f.read()
+
+
+class FastImportHistory:
+    """
+    Writes every simulated commit into one `git fast-import` process.
+    
+    Replaces a git add / git diff / git commit fork-exec per commit with a
+    single stream: files are read from the working tree, blobs and commits
+    are piped to fast-import, and the current branch is updated once at
+    the end.
+    """
+    
+    def __init__(self):
+        self.ref = git_output("symbolic-ref", "HEAD").decode().strip()
+        head = subprocess.run(["git", "rev-parse", "--verify", "-q", "HEAD"],
+                              capture_output=True, text=True).stdout.strip()
+        # First commit continues the checked-out branch
+        self.parent = head or None
+        # path -> (mode, blob id) of the branch tip, kept up to date as we commit
+        self.tree = {}
+        if head:
+            for line in git_output("ls-tree", "-r", "-z", "HEAD").split(b"\0"):
+                if line:
+                    meta, path = line.split(b"\t", 1)
+                    mode, _, sha = meta.decode().split()
+                    self.tree[path.decode()] = (mode, sha)
+        self.author = self._identity("GIT_AUTHOR_IDENT")
+        self.committer = self._identity("GIT_COMMITTER_IDENT")
+        self.next_mark = 1
+        self.proc = subprocess.Popen(
+            ["git", "fast-import", "--quiet", "--date-format=raw"],
+            stdin=subprocess.PIPE,
+        )
+    
+    @staticmethod
+    def _identity(var):
+        """'Name <email>' from git's configured identity (timestamp dropped)."""
+        ident = git_output("var", var).decode().strip()
+        return ident.rsplit(" ", 2)[0]
+    
+    def _write(self, data):
+        self.proc.stdin.write(data)
+    
+    def _data(self, payload):
+        self._write(b"data %d\n" % len(payload) + payload + b"\n")
+    
+    def changed(self, files):
+        """The subset of {path: (mode, content)} that differs from the branch tip."""
+        return {
+            path: (mode, data) for path, (mode, data) in files.items()
+            if self.tree.get(path) != (mode, blob_sha(data))
+        }
+    
+    def commit(self, timestamp, message, files):
+        """Emit one commit (at UTC epoch seconds) setting each path to its (mode, content)."""
+        modifies = []
+        for path, (mode, data) in files.items():
+            mark = self.next_mark
+            self.next_mark += 1
+            self._write(b"blob\nmark :%d\n" % mark)
+            self._data(data)
+            modifies.append(f"M {mode} :{mark} {path}\n".encode())
+            self.tree[path] = (mode, blob_sha(data))
         
-    subprocess.run(f'git commit -m "{message}"', shell=True, env=env)
-    print(f"✅ Committed: {date_str} - {message}")
+        when = f"{timestamp} +0000"
+        self._write(f"commit {self.ref}\n".encode())
+        self._write(f"author {self.author} {when}\n".encode())
+        self._write(f"committer {self.committer} {when}\n".encode())
+        self._data(message.encode())
+        if self.parent:
+            self._write(f"from {self.parent}\n".encode())
+            self.parent = None
+        for line in modifies:
+            self._write(line)
+        self._write(b"\n")
+    
+    def finish(self):
+        """Let fast-import update the branch, then sync the index to it."""
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError("git fast-import failed")
+        subprocess.run(["git", "reset", "--quiet"], check=True)
 
-def get_unique_messages(count, recent_messages):
+
+def list_group_files(groups):
+    """Files `git add` would pick up for each group's paths (one git call)."""
+    paths = [p for group in groups for p in group if os.path.exists(p)]
+    listed = []
+    if paths:
+        out = git_output("ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *paths)
+        listed = [f.decode() for f in out.split(b"\0") if f]
+    return [
+        [f for f in listed if os.path.lexists(f) and any(f == p or f.startswith(p.rstrip("/") + "/") for p in group)]
+        for group in groups
+    ]
+
+
+def git_commit(history, timestamp, message, files):
+    # Unchanged files are left out; with nothing left this is an empty commit
+    history.commit(timestamp, message, history.changed(files))
+    print(f"✅ Committed: {message}")
+
+def get_unique_messages(rng, count, recent_messages):
     """Get 'count' unique messages that aren't in 'recent_messages'."""
     available = [m for m in GENERIC_MESSAGES if m not in recent_messages]
     if len(available) < count:
         # If we run out, recycle least recent
         available = GENERIC_MESSAGES
     
-    selected = random.sample(available, k=min(count, len(available)))
-    return selected
+    picks = rng.choice(len(available), size=min(count, len(available)), replace=False)
+    return [available[i] for i in picks]
 
-def main():
-    print(f"🚀 Starting commit simulation on {BRANCH_NAME}...")
+def plan_schedule(rng):
+    """
+    Decide every commit up front.
+    
+    All random draws (rest days, commits per day, file groups per day,
+    times of day) are made as whole arrays, then split per day.
+    
+    Returns:
+        (timestamp, message, group_index) tuples in chronological order,
+        timestamp in UTC epoch seconds; group_index is None for a generic
+        README update
+    """
+    num_days = (END_DATE - START_DATE).days + 1
+    days = np.arange(num_days)
+    
+    # HUMAN BEHAVIOR: Skip weekends (80% chance) or random burnout (10%)
+    is_weekend = (START_DATE.weekday() + days) % 7 >= 5
+    skip = rng.random(num_days) < np.where(is_weekend, 0.8, 0.1)
+    counts = rng.choice(COMMITS_PER_DAY, size=num_days, p=COMMITS_PER_DAY_WEIGHTS / COMMITS_PER_DAY_WEIGHTS.sum())
+    # 0, 1, or 2 "real" file groups per day while there are groups left
+    groups_per_day = np.where(rng.random(num_days) < 0.7, 1, 2)
+    
+    # Time of day for every commit: mostly 9am - 10pm, 10% late night (00:00 - 02:00)
+    active = days[~skip]
+    total = int(counts[active].sum())
+    late = rng.random(total) < 0.1
+    hours = np.where(late, rng.integers(0, 3, size=total), rng.integers(9, 22, size=total))
+    seconds = hours * 3600 + rng.integers(0, 60, size=total) * 60
+    # Epoch seconds of every commit, split per day and sorted within each
+    timestamps = START_EPOCH + np.repeat(active, counts[active]).astype(np.int64) * SECONDS_PER_DAY + seconds
+    daily_timestamps = np.split(timestamps, np.cumsum(counts[active])[:-1])
     
-    current_date = START_DATE
+    for day in days[skip]:
+        print(f"😴 Skipping {(START_DATE + timedelta(days=int(day))).date()} (Rest day)")
+    
+    schedule = []
     group_index = 0
     recent_messages = [] # Keep track of last ~15 messages to avoid repetition
     
-    while current_date <= END_DATE:
-        # HUMAN BEHAVIOR: Skip weekends (80% chance) or random burnout (10%)
-        is_weekend = current_date.weekday() >= 5 
-        skip_prob = 0.8 if is_weekend else 0.1
-        
-        if random.random() < skip_prob:
-            print(f"😴 Skipping {current_date.date()} (Rest day)")
-            current_date += timedelta(days=1)
-            continue
-
-        # Randomize commits per day (broader range 2-9)
-        # Weights favor 4-6 range: [2, 3, 4, 5, 6, 7, 8, 9]
-        num_commits = random.choices([2, 3, 4, 5, 6, 7, 8, 9], weights=[1, 2, 4, 5, 4, 3, 2, 1])[0]
-        
-        print(f"\n📅 Processing Date: {current_date.date()} ({num_commits} commits)")
+    for day, day_timestamps in zip(active, daily_timestamps):
+        current_date = START_DATE + timedelta(days=int(day))
+        num_commits = int(counts[day])
+        print(f"📅 Planned Date: {current_date.date()} ({num_commits} commits)")
         
-        # Prepare messages for this day
         # If we still have file groups, use them first
-        daily_messages = []
-        commits_to_generate = num_commits
-        
-        files_to_stage_today = []
-        
-        # Determine how many "real" file groups to push today (0, 1, or 2)
-        if group_index < len(FILE_GROUPS):
-            groups_today = 1 if random.random() < 0.7 else 2
-            groups_today = min(groups_today, len(FILE_GROUPS) - group_index)
-            
-            for _ in range(groups_today):
-                files_to_stage_today.append( (FILE_GROUPS[group_index], COMMIT_MESSAGES[group_index]) )
-                group_index += 1
-                commits_to_generate -= 1
+        daily_commits = []
+        groups_today = min(int(groups_per_day[day]), len(FILE_GROUPS) - group_index)
+        for _ in range(groups_today):
+            daily_commits.append((COMMIT_MESSAGES[group_index], group_index))
+            group_index += 1
         
         # Get rest of messages from generic pool
+        commits_to_generate = num_commits - len(daily_commits)
         if commits_to_generate > 0:
-            generic_msgs = get_unique_messages(commits_to_generate, recent_messages)
-            for msg in generic_msgs:
-                daily_messages.append(msg)
+            for msg in get_unique_messages(rng, commits_to_generate, recent_messages):
+                daily_commits.append((msg, None))
                 recent_messages.append(msg)
-                if len(recent_messages) > 20: 
-                    recent_messages.pop(0)
-
-        # Shuffle daily messages? No, keep file groups first if any.
-        
-        for i in range(num_commits):
-            # Time of day: Mostly 9am - 10pm, occasional late night
-            # Better time logic: generate N random times between 9am and 10pm and sort them
-            pass 
+            del recent_messages[:-20]
         
-        # Better time logic: generate N random times between 9am and 10pm and sort them
-        times = []
-        for _ in range(num_commits):
-             # 10% chance of late night (00:00 - 02:00)
-            if random.random() < 0.1:
-                h = random.randint(0, 2)
-            else:
-                h = random.randint(9, 21)
-            m = random.randint(0, 59)
-            times.append(current_date.replace(hour=h, minute=m))
-        times.sort() # Ensure chronological order for the day
+        # Chronological order for the day, file groups first
+        for timestamp, (msg, group) in zip(np.sort(day_timestamps).tolist(), daily_commits):
+            schedule.append((timestamp, msg, group))
+    
+    return schedule
+
+def main():
+    print(f"🚀 Starting commit simulation on {BRANCH_NAME}...")
+    
+    schedule = plan_schedule(np.random.default_rng(RANDOM_SEED))
+    print(f"\n🗓️ {len(schedule)} commits planned\n")
+    
+    history = FastImportHistory()
+    group_files = list_group_files(FILE_GROUPS)
+    # README.md is appended to in memory and written back once at the end
+    try:
+        with open("README.md", "rb") as f:
+            readme = f.read()
+    except FileNotFoundError:
+        readme = b""
+    
+    for timestamp, msg, group in schedule:
+        if group is not None:
+            # Real file group
+            files = {f: read_worktree_file(f) for f in group_files[group]}
+        else:
+            # Generic update: trivial change
+            readme += f"\n<!-- {msg} -->".encode()
+            files = {"README.md": ("100644", readme)}
         
-        for i in range(num_commits):
-            commit_date = times[i]
-            
-            # Decide what to commit
-            if i < len(files_to_stage_today):
-                # Real file group
-                files, msg = files_to_stage_today[i]
-                for f in files:
-                    if os.path.exists(f):
-                        subprocess.run(f'git add "{f}"', shell=True)
-            else:
-                # Generic update
-                msg = daily_messages[i - len(files_to_stage_today)]
-                # Trivial change
-                with open("README.md", "a") as f:
-                    f.write(f"\n<!-- {msg} -->")
-                subprocess.run("git add README.md", shell=True)
-            
-            git_commit(commit_date, msg)
-            
-        current_date += timedelta(days=1)
+        git_commit(history, timestamp, msg, files)
+    
+    history.finish()
+    # Leave the working tree matching the new branch tip
+    if readme:
+        with open("README.md", "wb") as f:
+            f.write(readme)
 
     print("\n🏁 History simulation complete.")
 
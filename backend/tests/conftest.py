@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Add backend to path so `app` imports work from any working directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
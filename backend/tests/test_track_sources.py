@@ -0,0 +1,94 @@
+"""
+Per-vehicle state must stay separate per video source.
+
+Ultralytics numbers track IDs per tracker, so camera A's vehicle 1 and
+camera B's vehicle 1 are different cars.
+"""
+
+import numpy as np
+import pytest
+
+from app.services import detection
+from app.services.detection import (
+    DEFAULT_PARKING_ZONES,
+    detect_and_track,
+    reset_state,
+    set_parking_zones,
+    track_vehicles_batch,
+)
+
+
+class _Array:
+    def __init__(self, values):
+        self._values = np.asarray(values)
+    
+    def cpu(self):
+        return self
+    
+    def numpy(self):
+        return self._values
+
+
+class _Boxes:
+    def __init__(self, boxes):
+        self.xyxy = _Array(np.reshape([b[:4] for b in boxes], (-1, 4)))
+        self.conf = _Array([0.9] * len(boxes))
+        self.cls = _Array([2] * len(boxes))
+        self.id = _Array([b[4] for b in boxes])
+    
+    def __len__(self):
+        return len(self.conf.numpy())
+
+
+class _Result:
+    def __init__(self, boxes):
+        self.boxes = _Boxes(boxes)
+
+
+class FakeTracker:
+    """Stands in for a YOLO model: returns queued results from track()."""
+    
+    def __init__(self):
+        self.queue = []
+    
+    def track(self, source, **kwargs):
+        return self.queue.pop(0)
+
+
+FRAME = np.zeros((200, 200, 3), dtype=np.uint8)
+IN_ZONE = (10, 10, 60, 60)
+OUT_OF_ZONE = (120, 120, 180, 180)
+
+
+@pytest.fixture(autouse=True)
+def zone():
+    reset_state()
+    set_parking_zones([{"id": "z1", "polygon": [(0, 0), (100, 0), (100, 100), (0, 100)]}])
+    yield
+    set_parking_zones(DEFAULT_PARKING_ZONES)
+    reset_state()
+
+
+def test_same_track_id_on_two_sources_is_two_vehicles():
+    model = FakeTracker()
+    model.queue = [[_Result([(*IN_ZONE, 1)])], [_Result([(*OUT_OF_ZONE, 1)])]]
+    
+    result_a = detect_and_track(model, FRAME, source_id="cam-a")
+    result_b = detect_and_track(model, FRAME, source_id="cam-b")
+    
+    assert detection._sources["cam-a"].tracks[1].entry_time is not None
+    assert 1 not in detection._sources["cam-b"].tracks
+    assert result_a.detections[0].parking_zone == "z1"
+    assert result_b.detections[0].parking_zone is None
+
+
+def test_cleanup_uses_each_sources_own_active_ids():
+    t0 = 1000.0
+    detection._get_track(1, t0, "cam-a").start_parking("z1", t0, None)
+    
+    # Vehicle 1 left camera A; camera B happens to report its own vehicle 1
+    model = FakeTracker()
+    model.queue = [[_Result([]), _Result([(*OUT_OF_ZONE, 1)])]]
+    track_vehicles_batch(model, [FRAME, FRAME], ["cam-a", "cam-b"], now=t0 + 10.0)
+    
+    assert 1 not in detection._sources["cam-a"].tracks
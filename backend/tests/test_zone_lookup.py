@@ -0,0 +1,59 @@
+"""
+Zone lookup kernels must agree with OpenCV on which points are inside.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from app.services.detection import points_in_polygons
+
+
+POLYGONS = [
+    [(10, 10), (40, 10), (40, 30), (10, 30)],          # axis-aligned rectangle
+    [(50, 5), (80, 20), (60, 45)],                      # triangle, diagonal edges
+    [(5, 40), (30, 40), (30, 50), (15, 50), (15, 60), (5, 60)],  # concave L
+]
+
+
+def _pack(polygons):
+    poly_pts = np.concatenate([np.asarray(p, dtype=np.int32) for p in polygons])
+    poly_off = np.cumsum([0] + [len(p) for p in polygons])
+    return poly_pts, poly_off
+
+
+def _reference(points, polygons):
+    return np.array([
+        [cv2.pointPolygonTest(np.asarray(poly, dtype=np.int32), (float(x), float(y)), False) >= 0
+         for poly in polygons]
+        for x, y in points
+    ])
+
+
+def test_matches_point_polygon_test_on_grid():
+    # Every integer pixel, so all edges and vertices are covered
+    xs, ys = np.meshgrid(np.arange(0, 90), np.arange(0, 70))
+    points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+    
+    inside = points_in_polygons(points, *_pack(POLYGONS))
+    
+    np.testing.assert_array_equal(inside, _reference(points, POLYGONS))
+
+
+@pytest.mark.parametrize("point", [(40, 20), (25, 30), (40, 30), (10, 10), (30, 45), (65, 12.5)])
+def test_edges_and_vertices_count_as_inside(point):
+    inside = points_in_polygons(np.array([point], dtype=np.float64), *_pack(POLYGONS))
+    assert inside.any()
+
+
+def test_matches_fill_poly_mask_on_rectangles():
+    rects = [POLYGONS[0], POLYGONS[2]]
+    xs, ys = np.meshgrid(np.arange(0, 50), np.arange(0, 70))
+    points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+    
+    inside = points_in_polygons(points, *_pack(rects))
+    
+    for k, poly in enumerate(rects):
+        mask = np.zeros((70, 50), dtype=np.uint8)
+        cv2.fillPoly(mask, [np.asarray(poly, dtype=np.int32)], 1)
+        np.testing.assert_array_equal(inside[:, k], mask[points[:, 1], points[:, 0]].astype(bool))
@@ -3,7 +3,9 @@
 Setup Test Data for Real-time Detection
 Adds sample drivers and vehicles to test the complete flow
 """
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
@@ -12,6 +14,15 @@ from bson import ObjectId
 import bcrypt
 from datetime import datetime
 
+# bcrypt cost for seeded test accounts only (4 is the minimum, ~256x cheaper
+# than the default 12); real sign-ups keep bcrypt's default cost
+ROUNDS = int(os.getenv("SEED_BCRYPT_ROUNDS", "4"))
+
+
+def _hash_one(password: str) -> bytes:
+    """bcrypt hash of a seed password at the seed cost."""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(ROUNDS))
+
 
 def setup_test_data():
     """Add test drivers and vehicles to database."""
@@ -69,58 +80,79 @@ def setup_test_data():
 
     created_count = 0
 
+    # Skip users that already exist (one query) before paying for any hashing
+    usernames = [u['username'] for u in test_users]
+    existing_users = {
+        d['username'] for d in users_col.find({'username': {'$in': usernames}}, {'username': 1})
+    }
+    new_users = []
     for user_data in test_users:
-        # Check if user already exists
-        existing = users_col.find_one({'username': user_data['username']})
-        if existing:
+        if user_data['username'] in existing_users:
             print(f"⚠️  User '{user_data['username']}' already exists, skipping...")
             continue
-
-        # Create user
-        vehicles = user_data.pop('vehicles')
-        password = user_data.pop('password')
-
-        user_doc = {
-            'username': user_data['username'],
-            'email': user_data['email'],
-            'password_hash': bcrypt.hashpw(password.encode(), bcrypt.gensalt()),
-            'role': user_data.get('role', 'driver'),
-            'full_name': user_data['full_name'],
-            'phone': user_data['phone'],
-            'safety_score': 100,
-            'score_badge': 'Excellent',
-            'created_at': datetime.utcnow(),
-            'fcm_token': f'demo-token-{user_data["username"]}'  # For notifications
-        }
-
-        user_result = users_col.insert_one(user_doc)
-        user_id = user_result.inserted_id
-        print(f"✅ Created user: {user_data['username']} (ID: {user_id})")
-
-        # Add vehicles for this user
-        for vehicle_data in vehicles:
-            # Check if vehicle exists
-            existing_vehicle = vehicles_col.find_one({'license_plate': vehicle_data['plate']})
-            if existing_vehicle:
-                print(f"   ⚠️  Vehicle {vehicle_data['plate']} already exists, skipping...")
-                continue
-
-            vehicle_doc = {
-                'owner_id': str(user_id),
-                'license_plate': vehicle_data['plate'],
-                'vehicle_type': vehicle_data['type'],
-                'make': vehicle_data['make'],
-                'model': vehicle_data['model'],
-                'color': vehicle_data['color'],
-                'year': 2020,
-                'registered_at': datetime.utcnow()
+        new_users.append(user_data)
+
+    if new_users:
+        # Hash all passwords at once; bcrypt releases the GIL, so threads run
+        # the key schedules in parallel without process start-up cost
+        with ThreadPoolExecutor() as ex:
+            password_hashes = list(ex.map(_hash_one, [u['password'] for u in new_users]))
+
+        now = datetime.utcnow()
+        user_docs = [
+            {
+                'username': user_data['username'],
+                'email': user_data['email'],
+                'password_hash': password_hash,
+                'role': user_data.get('role', 'driver'),
+                'full_name': user_data['full_name'],
+                'phone': user_data['phone'],
+                'safety_score': 100,
+                'score_badge': 'Excellent',
+                'created_at': now,
+                'fcm_token': f'demo-token-{user_data["username"]}'  # For notifications
             }
+            for user_data, password_hash in zip(new_users, password_hashes)
+        ]
+        user_ids = users_col.insert_many(user_docs, ordered=False).inserted_ids
+
+        # Existing plates, also in one query
+        plates = [v['plate'] for u in new_users for v in u['vehicles']]
+        existing_plates = {
+            d['license_plate']
+            for d in vehicles_col.find({'license_plate': {'$in': plates}}, {'license_plate': 1})
+        }
 
-            vehicle_result = vehicles_col.insert_one(vehicle_doc)
-            print(f"   🚗 Added vehicle: {vehicle_data['plate']} ({vehicle_data['type']})")
-
-        created_count += 1
-        print()
+        vehicle_docs = []
+        for user_data, user_id in zip(new_users, user_ids):
+            print(f"✅ Created user: {user_data['username']} (ID: {user_id})")
+
+            # Add vehicles for this user
+            for vehicle_data in user_data['vehicles']:
+                if vehicle_data['plate'] in existing_plates:
+                    print(f"   ⚠️  Vehicle {vehicle_data['plate']} already exists, skipping...")
+                    continue
+                existing_plates.add(vehicle_data['plate'])
+
+                vehicle_docs.append({
+                    'owner_id': str(user_id),
+                    'license_plate': vehicle_data['plate'],
+                    'vehicle_type': vehicle_data['type'],
+                    'make': vehicle_data['make'],
+                    'model': vehicle_data['model'],
+                    'color': vehicle_data['color'],
+                    'year': 2020,
+                    'registered_at': now
+                })
+                print(f"   🚗 Adding vehicle: {vehicle_data['plate']} ({vehicle_data['type']})")
+
+            created_count += 1
+            print()
+
+        if vehicle_docs:
+            vehicles_col.insert_many(vehicle_docs, ordered=False)
+            print(f"🚗 Added {len(vehicle_docs)} vehicles")
+            print()
 
     print("="*70)
     print(f"✅ Setup complete! Created {created_count} test users with vehicles")
@@ -3,6 +3,29 @@ import sys
 import time
 import json
 
+# Where an auto-detected SUMO_HOME is remembered, so `brew --prefix` runs once
+SUMO_HOME_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "itms", "sumo_home")
+
+
+def _cached_sumo_home():
+    """SUMO_HOME found by an earlier run, if it still has a tools directory."""
+    try:
+        with open(SUMO_HOME_CACHE) as f:
+            sumo_home = f.read().strip()
+    except OSError:
+        return None
+    return sumo_home if os.path.isdir(os.path.join(sumo_home, 'tools')) else None
+
+
+def _cache_sumo_home(sumo_home):
+    try:
+        os.makedirs(os.path.dirname(SUMO_HOME_CACHE), exist_ok=True)
+        with open(SUMO_HOME_CACHE, "w") as f:
+            f.write(sumo_home)
+    except OSError:
+        pass
+
+
 # Try to import traci, if fails, try to append SUMO_HOME/tools
 try:
     import traci
@@ -14,18 +37,19 @@ except ImportError:
     else:
         # Try to auto-detect SUMO_HOME on macOS/Linux
         try:
-            import subprocess
-            result = subprocess.run(['brew', '--prefix', 'sumo'], capture_output=True, text=True)
-            if result.returncode == 0:
-                sumo_root = result.stdout.strip()
-                sumo_home = os.path.join(sumo_root, 'share', 'sumo')
-                os.environ['SUMO_HOME'] = sumo_home
-                tools = os.path.join(sumo_home, 'tools')
-                sys.path.append(tools)
-                import traci
+            sumo_home = _cached_sumo_home()
+            if sumo_home is None:
+                import subprocess
+                result = subprocess.run(['brew', '--prefix', 'sumo'], capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise ImportError("Could not auto-detect SUMO_HOME")
+                sumo_home = os.path.join(result.stdout.strip(), 'share', 'sumo')
                 print(f"✅ Auto-detected SUMO_HOME: {sumo_home}")
-            else:
-                raise ImportError("Could not auto-detect SUMO_HOME")
+            os.environ['SUMO_HOME'] = sumo_home
+            tools = os.path.join(sumo_home, 'tools')
+            sys.path.append(tools)
+            import traci
+            _cache_sumo_home(sumo_home)
         except Exception as e:
             raise ImportError("Please declare environment variable 'SUMO_HOME' or install traci via pip")
 
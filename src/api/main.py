@@ -11,21 +11,24 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 from bson import ObjectId
-import bcrypt
-import jwt
+import asyncio
 import os
 from dotenv import load_dotenv
 
+# argon2id for new password hashes when available; bcrypt hashes still verify
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHash, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
+
 # Add parent directory to path
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.database.connection import Database
-from src.database.models import (
-    User, Vehicle, Violation, DetectionLog, Warning,
-    DriverProfile, Payment, TrafficImpact, Camera
-)
 
 load_dotenv()
 
@@ -54,6 +57,9 @@ security = HTTPBearer()
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+# OWASP baseline for argon2id: 19 MiB, 2 iterations, 1 lane
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1) if ARGON2_AVAILABLE else None
 
 
 # ============================================================================
@@ -127,18 +133,65 @@ class PaymentCreate(BaseModel):
 # AUTHENTICATION UTILITIES
 # ============================================================================
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith("$2")
+
+
+# bcrypt and jwt are imported where used, keeping them out of app start-up
 
+def _hash_password_sync(password: str) -> str:
+    if password_hasher is not None:
+        return password_hasher.hash(password)
+    import bcrypt
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_COST)).decode('utf-8')
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    if _is_bcrypt_hash(hashed_password):
+        import bcrypt
+        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    if password_hasher is None:
+        return False
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHash):
+        return False
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with argon2id, or bcrypt without argon2-cffi (in a worker thread)."""
+    return await asyncio.to_thread(_hash_password_sync, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash (in a worker thread, off the event loop)."""
+    return await asyncio.to_thread(_verify_password_sync, plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True if a stored hash should be replaced on the next successful login.
+    
+    With argon2 available that is every legacy bcrypt hash and any argon2
+    hash made with other parameters; otherwise a bcrypt hash
+    ($2b$<cost>$...) made below BCRYPT_COST.
+    """
+    if password_hasher is not None:
+        if _is_bcrypt_hash(hashed_password):
+            return True
+        try:
+            return password_hasher.check_needs_rehash(hashed_password)
+        except (InvalidHash, ValueError):
+            return False
+    try:
+        return int(hashed_password.split("$")[2]) < BCRYPT_COST
+    except (IndexError, ValueError):
+        return False
 
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token."""
+    import jwt
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
@@ -147,6 +200,7 @@ def create_access_token(data: dict) -> str:
 
 def decode_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Decode and validate JWT token."""
+    import jwt
     try:
         token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -242,7 +296,7 @@ async def register(user_data: UserRegister):
     user_dict = {
         "username": user_data.username,
         "email": user_data.email,
-        "hashed_password": hash_password(user_data.password),
+        "hashed_password": await hash_password(user_data.password),
         "full_name": user_data.full_name,
         "phone": user_data.phone,
         "role": user_data.role,
@@ -277,13 +331,16 @@ async def login(credentials: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    if not verify_password(credentials.password, user["hashed_password"]):
+    if not await verify_password(credentials.password, user["hashed_password"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    # Update last login
+    # Update last login (and upgrade the hash if BCRYPT_COST was raised)
+    updates = {"last_login": datetime.utcnow()}
+    if needs_rehash(user["hashed_password"]):
+        updates["hashed_password"] = await hash_password(credentials.password)
     db.users.update_one(
         {"_id": user["_id"]},
-        {"$set": {"last_login": datetime.utcnow()}}
+        {"$set": updates}
     )
 
     # Create access token